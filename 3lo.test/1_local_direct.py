@@ -21,22 +21,23 @@ Usage:
    python 1_local_direct.py
 """
 
-import json
 import os
-from datetime import datetime, timedelta
+import sys
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 from oauth2_callback_server import (
     store_token_in_oauth2_callback_server,
     wait_for_oauth2_server_to_be_ready,
     get_oauth2_callback_url
 )
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as _json_loads
+
 # Allow OAuth2 over HTTP for local development
 # WARNING: This should only be used for local development, never in production
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
@@ -65,8 +66,8 @@ def load_google_credentials():
             "Please ensure google_cred.json exists in the same directory."
         )
     
-    with open(CREDENTIALS_FILE, 'r') as f:
-        creds_data = json.load(f)
+    with open(CREDENTIALS_FILE, 'rb') as f:
+        creds_data = _json_loads(f.read())
     
     print("✓ Credentials loaded successfully")
     return creds_data
@@ -103,6 +104,11 @@ def get_authenticated_credentials():
     Returns:
         Credentials: Authenticated Google OAuth2 credentials
     """
+    # Deferred so that config errors (e.g. missing google_cred.json) fail fast
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    
     creds = None
     
     # Check if we have cached credentials
@@ -161,9 +167,11 @@ def get_authenticated_credentials():
                 print("Storing token in OAuth2 callback server...")
                 store_token_in_oauth2_callback_server(creds.token)
         
-        # Save the credentials for future use
-        with open(TOKEN_FILE, 'w') as token:
-            token.write(creds.to_json())
+        # Save the credentials for future use. Write to a temp file and
+        # rename so concurrent runs never read a partially written token.json
+        tmp_file = TOKEN_FILE.with_suffix('.json.tmp')
+        tmp_file.write_bytes(creds.to_json().encode('utf-8'))
+        os.replace(tmp_file, TOKEN_FILE)
         print("✓ Credentials saved to token.json")
     else:
         print("✓ Using valid cached credentials")
@@ -171,6 +179,24 @@ def get_authenticated_credentials():
     return creds
 
 
+@lru_cache(maxsize=4)
+def get_calendar_service(credentials):
+    """Build the Google Calendar API service once per credentials object.
+    
+    The discovery document and the underlying HTTP client are reused by
+    every subsequent call made with the same credentials.
+    
+    Args:
+        credentials: Authenticated Google OAuth2 credentials
+    
+    Returns:
+        Resource: Google Calendar v3 API service
+    """
+    from googleapiclient.discovery import build
+    
+    return build('calendar', 'v3', credentials=credentials)
+
+
 def get_calendar_events(credentials, weeks=4):
     """
     Retrieve calendar events for the next specified number of weeks.
@@ -182,17 +208,19 @@ def get_calendar_events(credentials, weeks=4):
     Returns:
         list: List of calendar events
     """
+    from googleapiclient.errors import HttpError
+    
     try:
         # Build the Calendar API service
-        service = build('calendar', 'v3', credentials=credentials)
+        service = get_calendar_service(credentials)
         
         # Calculate time range
-        now = datetime.utcnow()
+        now = datetime.now(UTC)
         end_date = now + timedelta(weeks=weeks)
         
         # Format dates for API (RFC3339 format)
-        time_min = now.isoformat() + 'Z'
-        time_max = end_date.isoformat() + 'Z'
+        time_min = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        time_max = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
         
         print(f"\nFetching calendar events from {now.date()} to {end_date.date()}")
         print(f"(Next {weeks} weeks)\n")
@@ -224,27 +252,36 @@ def get_calendar_events(credentials, weeks=4):
             # Parse and format the start time
             if 'T' in start:
                 # DateTime event
-                dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                formatted_time = dt.strftime('%Y-%m-%d %I:%M %p')
+                if start.endswith('Z'):
+                    start = start[:-1] + '+00:00'
+                dt = datetime.fromisoformat(start)
+                # Same output as strftime('%Y-%m-%d %I:%M %p') without locale lookups
+                hour12 = (dt.hour + 11) % 12 + 1
+                ampm = 'AM' if dt.hour < 12 else 'PM'
+                formatted_time = (
+                    f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+                    f"{hour12:02d}:{dt.minute:02d} {ampm}"
+                )
             else:
                 # All-day event
                 formatted_time = f"{start} (All day)"
             
-            print(f"• {formatted_time}")
-            print(f"  {summary}")
+            # Build the whole event block and write it in one call
+            parts = [f"• {formatted_time}\n  {summary}\n"]
             
             # Show location if available
             if 'location' in event:
-                print(f"  Location: {event['location']}")
+                parts.append(f"  Location: {event['location']}\n")
             
             # Show description if available (truncated)
             if 'description' in event:
                 desc = event['description']
                 if len(desc) > 100:
                     desc = desc[:97] + '...'
-                print(f"  Description: {desc}")
+                parts.append(f"  Description: {desc}\n")
             
-            print()
+            parts.append("\n")
+            sys.stdout.write(''.join(parts))
         
         print("=" * 80)
         
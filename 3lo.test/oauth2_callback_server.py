@@ -20,17 +20,24 @@ This server is used in conjunction with agents running on AgentCore Runtime that
 4. Server completes the authentication flow with AgentCore Identity
 """
 
-import time
-import uvicorn
-import logging
 import argparse
-import requests
-import json
-
+import logging
+import time
 from datetime import timedelta
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import HTMLResponse
+from functools import cache, lru_cache
+
+import requests
+import uvicorn
 from bedrock_agentcore.services.identity import IdentityClient, UserTokenIdentifier
+from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as _json_loads
 
 # Configuration constants for the OAuth2 callback server
 OAUTH2_CALLBACK_SERVER_PORT = 9090  # Port where the callback server listens
@@ -41,9 +48,116 @@ OAUTH2_CALLBACK_ENDPOINT = (
 USER_IDENTIFIER_ENDPOINT = (
     "/userIdentifier/token"  # Endpoint to store user token identifiers
 )
+WORKSHOP_METADATA_FILE = "/opt/ml/metadata/resource-metadata.json"
+READINESS_INITIAL_DELAY_SECONDS = 0.05  # First backoff delay between /ping probes
+READINESS_MAX_DELAY_SECONDS = 1.0  # Upper bound for the backoff delay
 
 logger = logging.getLogger(__name__)
 
+# Page returned to the browser once the 3LO flow completes. It never changes,
+# so it is encoded once here instead of on every callback.
+_SUCCESS_HTML = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>OAuth2 Success</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            height: 100vh;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            font-family: Arial, sans-serif;
+            background-color: #f5f5f5;
+        }
+        .container {
+            text-align: center;
+            padding: 2rem;
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
+        }
+        h1 {
+            color: #28a745;
+            margin: 0;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Completed OAuth2 3LO flow successfully</h1>
+    </div>
+</body>
+</html>
+"""
+_SUCCESS_RESPONSE_HEADERS = {"content-type": "text/html; charset=utf-8"}
+
+# Shared HTTP session for internal (localhost) calls to the callback server.
+# Reusing one session keeps the TCP connection alive across the readiness
+# polling loop and token storage calls instead of reconnecting every time.
+_HTTP = requests.Session()
+_HTTP.mount(
+    "http://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=Retry(total=0)),
+)
+
+
+@cache
+def _identity_client(region: str) -> IdentityClient:
+    """Get a process-wide AgentCore Identity client for the given region.
+
+    Args:
+        region (str): AWS region where AgentCore Identity service is deployed
+
+    Returns:
+        IdentityClient: Cached client, reused across server instances
+    """
+    return IdentityClient(region=region)
+
+
+@cache
+def _sagemaker_client():
+    """Get a process-wide SageMaker client used to resolve the Studio proxy URL.
+
+    Returns:
+        botocore.client.BaseClient: Cached SageMaker client
+    """
+    import boto3
+
+    return boto3.client("sagemaker")
+
+
+@lru_cache(maxsize=1)
+def _read_workshop_metadata() -> dict | None:
+    """Read the SageMaker resource metadata file once per process.
+
+    Returns:
+        dict | None: Parsed metadata, or None when not running in Workshop Studio
+
+    Raises:
+        ValueError: If the file is not valid JSON (not cached, so a partially
+            written file is read again on the next call)
+    """
+    try:
+        with open(WORKSHOP_METADATA_FILE, "rb") as file:
+            return _json_loads(file.read())
+    except FileNotFoundError:
+        return None
+
+
+def _load_workshop_metadata() -> dict | None:
+    """Load the SageMaker resource metadata, memoizing only successful reads.
+
+    Returns:
+        dict | None: Parsed metadata, or None when not running in Workshop Studio
+            or the file could not be parsed
+    """
+    try:
+        return _read_workshop_metadata()
+    except ValueError:
+        return None
+
 
 def _is_workshop_studio() -> bool:
     """
@@ -52,12 +166,24 @@ def _is_workshop_studio() -> bool:
     Returns:
         bool: True if running in Workshop Studio, False otherwise
     """
-    try:
-        with open("/opt/ml/metadata/resource-metadata.json", "r") as file:
-            json.load(file)
-        return True
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+    return _load_workshop_metadata() is not None
+
+
+@lru_cache(maxsize=1)
+def _sagemaker_proxy_base_url() -> str:
+    """Resolve the SageMaker Studio proxy URL for the callback server.
+
+    Only successful lookups are cached; errors propagate so that the next call
+    retries instead of pinning a fallback for the rest of the process.
+
+    Returns:
+        str: https://<space url>/proxy/<port>
+    """
+    data = _load_workshop_metadata()
+    response = _sagemaker_client().describe_space(
+        DomainId=data["DomainId"], SpaceName=data["SpaceName"]
+    )
+    return response["Url"] + f"/proxy/{OAUTH2_CALLBACK_SERVER_PORT}"
 
 
 def get_oauth2_callback_base_url() -> str:
@@ -74,6 +200,11 @@ def get_oauth2_callback_base_url() -> str:
     Returns:
         str: Browser-accessible base URL for OAuth callbacks
 
+    Note:
+        A resolved SageMaker URL is cached for the lifetime of the process,
+        since the space URL does not change at runtime. The localhost fallback
+        after a failed lookup is not cached.
+
     Usage:
         This URL is used for:
         1. Workload identity allowedResourceOauth2ReturnUrls registration
@@ -86,18 +217,7 @@ def get_oauth2_callback_base_url() -> str:
         return base_url
 
     try:
-        import boto3
-
-        with open("/opt/ml/metadata/resource-metadata.json", "r") as file:
-            data = json.load(file)
-            domain_id = data["DomainId"]
-            space_name = data["SpaceName"]
-
-        sagemaker_client = boto3.client("sagemaker")
-        response = sagemaker_client.describe_space(
-            DomainId=domain_id, SpaceName=space_name
-        )
-        base_url = response["Url"] + f"/proxy/{OAUTH2_CALLBACK_SERVER_PORT}"
+        base_url = _sagemaker_proxy_base_url()
         logger.info(
             f"External OAuth callback base URL (SageMaker): {base_url}")
         return base_url
@@ -149,7 +269,7 @@ class OAuth2CallbackServer:
             region (str): AWS region where AgentCore Identity service is deployed
         """
         # Initialize AgentCore Identity client for the specified region
-        self.identity_client = IdentityClient(region=region)
+        self.identity_client = _identity_client(region)
 
         # Storage for user token identifier - used to bind OAuth sessions to specific users
         # This is set via the USER_IDENTIFIER_ENDPOINT before OAuth flow begins
@@ -242,43 +362,11 @@ class OAuth2CallbackServer:
                 session_uri=session_id, user_identifier=self.user_token_identifier
             )
 
-            html_content = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>OAuth2 Success</title>
-                <style>
-                    body {
-                        margin: 0;
-                        padding: 0;
-                        height: 100vh;
-                        display: flex;
-                        justify-content: center;
-                        align-items: center;
-                        font-family: Arial, sans-serif;
-                        background-color: #f5f5f5;
-                    }
-                    .container {
-                        text-align: center;
-                        padding: 2rem;
-                        background-color: white;
-                        border-radius: 8px;
-                        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-                    }
-                    h1 {
-                        color: #28a745;
-                        margin: 0;
-                    }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>Completed OAuth2 3LO flow successfully</h1>
-                </div>
-            </body>
-            </html>
-            """
-            return HTMLResponse(content=html_content, status_code=200)
+            return Response(
+                content=_SUCCESS_HTML,
+                status_code=200,
+                headers=_SUCCESS_RESPONSE_HEADERS,
+            )
 
     def get_app(self) -> FastAPI:
         """
@@ -341,7 +429,7 @@ def store_token_in_oauth2_callback_server(user_token_value: str):
     """
     if user_token_value:
         base_url = _get_internal_base_url()
-        requests.post(
+        _HTTP.post(
             f"{base_url}{USER_IDENTIFIER_ENDPOINT}",
             json={"user_token": user_token_value},
             timeout=2,
@@ -391,11 +479,15 @@ def wait_for_oauth2_server_to_be_ready(
     base_url = _get_internal_base_url()
     timeout_in_seconds = duration.seconds
 
+    # Probe immediately, then back off exponentially so a server that is
+    # already up is detected in milliseconds rather than after a fixed sleep
+    delay = READINESS_INITIAL_DELAY_SECONDS
     start_time = time.time()
+    next_log = start_time + 10
     while time.time() - start_time < timeout_in_seconds:
         try:
             # Ping the server's health check endpoint
-            response = requests.get(
+            response = _HTTP.get(
                 f"{base_url}{PING_ENDPOINT}",
                 timeout=2,
             )
@@ -406,12 +498,16 @@ def wait_for_oauth2_server_to_be_ready(
             # Server not ready yet, continue waiting
             pass
 
-        time.sleep(2)
-        elapsed = int(time.time() - start_time)
+        time.sleep(delay)
+        delay = min(delay * 2, READINESS_MAX_DELAY_SECONDS)
 
         # Log progress every 10 seconds to show we're still waiting
-        if elapsed % 10 == 0 and elapsed > 0:
-            logger.info(f"Still waiting... ({elapsed}/{timeout_in_seconds}s)")
+        now = time.time()
+        if now >= next_log:
+            logger.info(
+                f"Still waiting... ({int(now - start_time)}/{timeout_in_seconds}s)"
+            )
+            next_log += 10
 
     logger.error(
         f"Timeout: OAuth2 callback server not ready after {timeout_in_seconds} seconds"
@@ -461,10 +557,17 @@ def main():
     logger.info(f"External callback URL: {base_url}{OAUTH2_CALLBACK_ENDPOINT}")
 
     # Start the FastAPI server using uvicorn
+    # "auto" picks uvloop and the httptools parser when they are installed
+    # (see requirements.txt) and falls back to asyncio/h11 otherwise, e.g. on
+    # Windows. The access log is disabled so /ping polling doesn't log per probe.
     uvicorn.run(
         oauth2_callback_server.get_app(),
         host=host,
         port=OAUTH2_CALLBACK_SERVER_PORT,
+        loop="auto",
+        http="auto",
+        access_log=False,
+        log_level="warning",
     )
 
 
@@ -1,4 +1,8 @@
 import os
+from functools import cache, lru_cache
+
+import boto3
+from botocore.config import Config
 from langchain_aws import ChatBedrock
 from langchain.agents import create_agent as create_react_agent
 from multi_region_memory_saver import MultiRegionAgentCoreMemorySaver
@@ -6,23 +10,34 @@ from multi_region_memory_saver import MultiRegionAgentCoreMemorySaver
 
 # Cross-region inference profiles by region prefix
 # US regions use "us." prefix, EU regions use "eu." prefix
+MODEL_IDS_BY_REGION_PREFIX = {
+    "us-": "us.anthropic.claude-haiku-4-5-20251001-v1:0",
+    "eu-": "eu.anthropic.claude-haiku-4-5-20251001-v1:0",
+    "ap-": "apac.anthropic.claude-haiku-4-5-20251001-v1:0",
+}
+
+
+@lru_cache(maxsize=8)
 def get_model_id(region):
-    if region.startswith("us-"):
-        return "us.anthropic.claude-haiku-4-5-20251001-v1:0"
-    elif region.startswith("eu-"):
-        return "eu.anthropic.claude-haiku-4-5-20251001-v1:0"
-    elif region.startswith("ap-"):
-        return "apac.anthropic.claude-haiku-4-5-20251001-v1:0"
-    else:
-        raise ValueError(f"Unsupported region: {region}")
+    try:
+        return MODEL_IDS_BY_REGION_PREFIX[region[:3]]
+    except KeyError:
+        raise ValueError(f"Unsupported region: {region}") from None
 
 
-def create_agent():
-    primary_region = os.environ["PRIMARY_REGION"]
-    secondary_region = os.environ["SECONDARY_REGION"]
-    primary_memory_id = os.environ["PRIMARY_MEMORY_ID"]
-    secondary_memory_id = os.environ["SECONDARY_MEMORY_ID"]
-    
+# Shared Bedrock runtime clients, one per region, so every agent built in this
+# process reuses the same connection pool instead of creating its own client
+@cache
+def _bedrock_runtime_client(region):
+    session = boto3.session.Session(region_name=region)
+    return session.client(
+        "bedrock-runtime",
+        config=Config(max_pool_connections=20, retries={"max_attempts": 2, "mode": "adaptive"}),
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_agent(primary_region, secondary_region, primary_memory_id, secondary_memory_id):
     checkpointer = MultiRegionAgentCoreMemorySaver(
         primary_region=primary_region,
         secondary_region=secondary_region,
@@ -31,9 +46,24 @@ def create_agent():
     )
     
     model_id = get_model_id(primary_region)
-    llm = ChatBedrock(model_id=model_id, region_name=primary_region)
+    llm = ChatBedrock(
+        model_id=model_id,
+        region_name=primary_region,
+        client=_bedrock_runtime_client(primary_region),
+    )
     return create_react_agent(model=llm, tools=[], checkpointer=checkpointer)
 
+
+def create_agent():
+    # The compiled graph is cached per region/memory configuration, so repeated
+    # calls with the same environment reuse one Bedrock client and graph.
+    return _build_agent(
+        os.environ["PRIMARY_REGION"],
+        os.environ["SECONDARY_REGION"],
+        os.environ["PRIMARY_MEMORY_ID"],
+        os.environ["SECONDARY_MEMORY_ID"],
+    )
+
 def invoke_agent(graph, message: str, thread_id: str, actor_id: str):
     config = {"configurable": {"thread_id": thread_id, "actor_id": actor_id}}
     return graph.invoke({"messages": [("human", message)]}, config=config)
\ No newline at end of file
@@ -1,31 +1,89 @@
 #!/usr/bin/env python3
-import boto3, json, argparse, uuid
+import boto3, orjson, argparse, uuid, os, io, sys, codecs, threading
+from functools import cache
+from pathlib import Path
 
 AGENT_NAME = "dr_poc_agent"
+ARN_CACHE_DIR = Path.home() / ".cache" / "agentcore_dr"
+CREDENTIALS_REFRESH_SECONDS = 600
+_SESSION = boto3.Session()
 
-def get_agent_runtime_arn(region):
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
-    for page in client.get_paginator("list_agent_runtimes").paginate():
+@cache
+def _client(service, region):
+    """Return a process-wide boto3 client for (service, region)."""
+    return _SESSION.client(service, region_name=region)
+
+def _find_agent_runtime_arn(client):
+    for page in client.get_paginator("list_agent_runtimes").paginate(PaginationConfig={"PageSize": 100}):
         for runtime in page.get("agentRuntimes", []):
             if runtime["agentRuntimeName"] == AGENT_NAME:
                 return runtime["agentRuntimeArn"]
     return None
 
-def invoke_agent(arn, prompt, session_id, thread_id, region):
-    client = boto3.client("bedrock-agentcore", region_name=region)
+def get_agent_runtime_arn(region, refresh=False):
+    """Resolve the runtime ARN, using the on-disk cache unless it is missing or stale."""
+    cache_file = ARN_CACHE_DIR / f"{region}-{AGENT_NAME}.arn"
+    if cache_file.exists() and not refresh:
+        return cache_file.read_text().strip()
+
+    # Only built once the cache cannot answer on its own
+    client = _client("bedrock-agentcore-control", region)
+    if cache_file.exists():
+        arn = cache_file.read_text().strip()
+        try:
+            client.get_agent_runtime(agentRuntimeId=arn.rsplit("/", 1)[-1])
+            return arn
+        except client.exceptions.ResourceNotFoundException:
+            pass
+
+    arn = _find_agent_runtime_arn(client)
+    if arn:
+        ARN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(arn)
+        os.replace(tmp_file, cache_file)
+    return arn
+
+def invoke_agent(arn, prompt, session_id, thread_id, region, out=None):
+    """Invoke the runtime and return its answer, echoing chunks to ``out`` as they arrive."""
+    client = _client("bedrock-agentcore", region)
     response = client.invoke_agent_runtime(
         agentRuntimeArn=arn, qualifier="DEFAULT", runtimeSessionId=session_id,
-        payload=json.dumps({"prompt": prompt, "thread_id": thread_id})
+        payload=orjson.dumps({"prompt": prompt, "thread_id": thread_id})
     )
-    return "".join(event.decode("utf-8") for event in response.get("response", []))
+    # Incremental decoder so multi-byte characters split across chunks decode correctly
+    decoder, buf = codecs.getincrementaldecoder("utf-8")(), io.StringIO()
+    for event in response.get("response", []):
+        text = decoder.decode(event)
+        buf.write(text)
+        if out is not None:
+            out.write(text)
+            out.flush()
+    # Flush the decoder so a truncated trailing sequence raises instead of being dropped
+    text = decoder.decode(b"", final=True)
+    buf.write(text)
+    if out is not None:
+        out.write(text)
+        out.flush()
+    return buf.getvalue()
+
+def _start_credentials_refresher(stop):
+    """Refresh credentials in the background so STS refresh happens during user think-time."""
+    def refresh():
+        while not stop.wait(CREDENTIALS_REFRESH_SECONDS):
+            credentials = _SESSION.get_credentials()
+            if credentials is not None:
+                credentials.get_frozen_credentials()
+    threading.Thread(target=refresh, name="credentials-refresher", daemon=True).start()
 
 def main():
     parser = argparse.ArgumentParser(description="Interactive CLI for AgentCore runtime")
     parser.add_argument("--actor-id", required=True, help="Actor ID for the session")
     parser.add_argument("--region", required=True, help="AWS region")
+    parser.add_argument("--refresh", action="store_true", help="Re-validate the cached agent runtime ARN")
     args = parser.parse_args()
 
-    arn = get_agent_runtime_arn(args.region)
+    arn = get_agent_runtime_arn(args.region, refresh=args.refresh)
     if not arn:
         print(f"Error: Agent runtime '{AGENT_NAME}' not found in {args.region}")
         return
@@ -35,6 +93,8 @@ def main():
     print("Type 'quit' or 'exit' to end the session.\n")
 
     session_id, thread_id = f"session-{uuid.uuid4()}", args.actor_id
+    stop_refresher = threading.Event()
+    _start_credentials_refresher(stop_refresher)
     while True:
         try:
             user_input = input(f"{args.actor_id}> ").strip()
@@ -42,10 +102,12 @@ def main():
                 break
             if not user_input:
                 continue
-            response = invoke_agent(arn, user_input, session_id, thread_id, args.region)
-            print(f"{args.actor_id}: {response}\n")
+            sys.stdout.write(f"{args.actor_id}: ")
+            invoke_agent(arn, user_input, session_id, thread_id, args.region, out=sys.stdout)
+            print("\n")
         except KeyboardInterrupt:
             break
+    stop_refresher.set()
     print("\nSession ended.")
 
 if __name__ == "__main__":
@@ -11,6 +11,8 @@ knows about the other region's memory ID for cross-region replication.
 - eu-west-1's SECONDARY_REGION = us-west-2
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 
 AGENT_NAME = "dr_poc_agent"
@@ -18,30 +20,48 @@ REGION_US = "us-west-2"
 REGION_EU = "eu-west-1"
 
 
-def get_agent_runtime_id(region: str, agent_name: str) -> str:
+def control_client(region: str):
+    """Create a bedrock-agentcore-control client for a region.
+
+    Call this on the main thread: creating clients from the default boto3
+    session is not thread-safe, so worker threads only receive ready clients.
+    """
+    return boto3.client("bedrock-agentcore-control", region_name=region)
+
+
+def get_agent_runtime_id(region: str, agent_name: str, client=None) -> str:
     """Get agent runtime ID by name."""
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
+    client = client or control_client(region)
     paginator = client.get_paginator("list_agent_runtimes")
-    for page in paginator.paginate():
+    # Pages are fetched lazily, so returning on the first match stops paging
+    for page in paginator.paginate(PaginationConfig={"PageSize": 100}):
         for runtime in page["agentRuntimes"]:
             if runtime["agentRuntimeName"] == agent_name:
                 return runtime["agentRuntimeId"]
     raise ValueError(f"Agent runtime '{agent_name}' not found in {region}")
 
 
-def get_agent_runtime(region: str, runtime_id: str) -> dict:
+def get_agent_runtime(region: str, runtime_id: str, client=None) -> dict:
     """Get agent runtime details including environment variables."""
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
+    client = client or control_client(region)
     response = client.get_agent_runtime(agentRuntimeId=runtime_id)
     return response
 
 
-def update_agent_runtime_env(region: str, runtime_id: str, env_updates: dict) -> None:
-    """Update agent runtime environment variables."""
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
+def update_agent_runtime_env(
+    region: str, runtime_id: str, env_updates: dict, runtime: dict | None = None, client=None
+) -> None:
+    """Update agent runtime environment variables.
+
+    Pass ``runtime`` when the caller already fetched the runtime details to
+    avoid describing it a second time, and ``client`` when calling from a
+    worker thread.
+    """
+    client = client or control_client(region)
     
     # Get current runtime config
-    runtime = get_agent_runtime(region, runtime_id)
+    if runtime is None:
+        runtime = get_agent_runtime(region, runtime_id, client)
     current_env = runtime.get("environmentVariables", {})
     
     # Merge updates
@@ -61,16 +81,23 @@ def update_agent_runtime_env(region: str, runtime_id: str, env_updates: dict) ->
 def main():
     print("Fetching agent runtime configurations...")
     
-    # Get runtime IDs
-    us_runtime_id = get_agent_runtime_id(REGION_US, AGENT_NAME)
-    eu_runtime_id = get_agent_runtime_id(REGION_EU, AGENT_NAME)
+    # Clients are built here, on the main thread, and shared with the workers
+    us_client = control_client(REGION_US)
+    eu_client = control_client(REGION_EU)
+    
+    # Get runtime IDs (both regions looked up concurrently)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        us_lookup = executor.submit(get_agent_runtime_id, REGION_US, AGENT_NAME, us_client)
+        eu_lookup = executor.submit(get_agent_runtime_id, REGION_EU, AGENT_NAME, eu_client)
+        us_runtime_id = us_lookup.result()
+        eu_runtime_id = eu_lookup.result()
     
     print(f"{REGION_US} runtime ID: {us_runtime_id}")
     print(f"{REGION_EU} runtime ID: {eu_runtime_id}")
     
     # Get current configs from both regions
-    us_runtime = get_agent_runtime(REGION_US, us_runtime_id)
-    eu_runtime = get_agent_runtime(REGION_EU, eu_runtime_id)
+    us_runtime = get_agent_runtime(REGION_US, us_runtime_id, us_client)
+    eu_runtime = get_agent_runtime(REGION_EU, eu_runtime_id, eu_client)
     
     us_env = us_runtime.get("environmentVariables", {})
     eu_env = eu_runtime.get("environmentVariables", {})
@@ -86,19 +113,21 @@ def main():
     print(f"\n{REGION_US} PRIMARY_MEMORY_ID: {us_primary_memory_id}")
     print(f"{REGION_EU} PRIMARY_MEMORY_ID: {eu_primary_memory_id}")
     
-    # Update us-west-2: set secondary to eu-west-1's primary
-    print(f"\nUpdating {REGION_US}...")
-    update_agent_runtime_env(REGION_US, us_runtime_id, {
-        "SECONDARY_REGION": REGION_EU,
-        "SECONDARY_MEMORY_ID": eu_primary_memory_id,
-    })
-    
-    # Update eu-west-1: set secondary to us-west-2's primary
-    print(f"\nUpdating {REGION_EU}...")
-    update_agent_runtime_env(REGION_EU, eu_runtime_id, {
-        "SECONDARY_REGION": REGION_US,
-        "SECONDARY_MEMORY_ID": us_primary_memory_id,
-    })
+    # Update both regions concurrently:
+    # - us-west-2: set secondary to eu-west-1's primary
+    # - eu-west-1: set secondary to us-west-2's primary
+    print(f"\nUpdating {REGION_US} and {REGION_EU}...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        us_update = executor.submit(update_agent_runtime_env, REGION_US, us_runtime_id, {
+            "SECONDARY_REGION": REGION_EU,
+            "SECONDARY_MEMORY_ID": eu_primary_memory_id,
+        }, runtime=us_runtime, client=us_client)
+        eu_update = executor.submit(update_agent_runtime_env, REGION_EU, eu_runtime_id, {
+            "SECONDARY_REGION": REGION_US,
+            "SECONDARY_MEMORY_ID": us_primary_memory_id,
+        }, runtime=eu_runtime, client=eu_client)
+        us_update.result()
+        eu_update.result()
     
     print("\nMemory replication enabled successfully!")
 
@@ -5,9 +5,18 @@ This module provides a wrapper around AgentCoreMemorySaver that supports
 dual-region writes for high availability and disaster recovery scenarios.
 
 Read operations: Primary region only
-Write operations: Both regions (success requires both to succeed)
+Write operations: Both regions. Checkpoints (put / aput) only require the
+primary to succeed; a failed secondary checkpoint write is queued and retried
+in the background with exponential backoff. Intermediate writes and deletes
+require both regions to succeed.
 """
 
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, AsyncIterator, Iterator, Optional, Sequence
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
@@ -19,6 +28,13 @@ from langgraph.checkpoint.base import (
 )
 from langgraph_checkpoint_aws import AgentCoreMemorySaver
 
+logger = logging.getLogger(__name__)
+
+# Background retry schedule for secondary checkpoint writes that failed
+SECONDARY_RETRY_INITIAL_DELAY_SECONDS = 1.0
+SECONDARY_RETRY_MAX_DELAY_SECONDS = 60.0
+SECONDARY_RETRY_MAX_ATTEMPTS = 5
+
 
 class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
     """
@@ -26,7 +42,9 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
     
     - Reads from primary region only
     - Writes to both primary and secondary regions
-    - Write operations only return success when both regions succeed
+    - Checkpoint writes succeed when the primary succeeds; secondary failures
+      are retried in the background
+    - Intermediate writes and deletes only succeed when both regions succeed
     """
 
     def __init__(
@@ -53,6 +71,23 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         
         self.primary_saver = AgentCoreMemorySaver(primary_memory_id, region_name=primary_region)
         self.secondary_saver = AgentCoreMemorySaver(secondary_memory_id, region_name=secondary_region)
+        
+        # One worker per region so sync dual writes run concurrently
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mrsaver")
+        
+        # Secondary checkpoint writes awaiting reconciliation. Async retries are
+        # drained by a task on the running event loop (recreated when the loop
+        # changes); sync retries run in order on a single background thread.
+        self._reconcile_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconcile_queue: Optional[asyncio.Queue] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._retry_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mrsaver-retry")
+        
+        # (thread_id, checkpoint_ns) -> queued retries, and the newest checkpoint
+        # id replicated for those threads, so superseded retries are dropped
+        self._retry_counts: Counter = Counter()
+        self._latest_replicated: dict[tuple, str] = {}
+        self._replicated_lock = threading.Lock()
 
     @property
     def config_specs(self):
@@ -88,9 +123,9 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         limit: Optional[int] = None,
     ) -> Iterator[CheckpointTuple]:
         """List checkpoints from primary region."""
-        yield from self.primary_saver.list(config, filter=filter, before=before, limit=limit)
+        return self.primary_saver.list(config, filter=filter, before=before, limit=limit)
 
-    async def alist(
+    def alist(
         self,
         config: Optional[RunnableConfig],
         *,
@@ -98,14 +133,14 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
     ) -> AsyncIterator[CheckpointTuple]:
-        """Async list checkpoints from primary region."""
-        async for checkpoint in self.primary_saver.alist(
-            config, filter=filter, before=before, limit=limit
-        ):
-            yield checkpoint
+        """Async list checkpoints from primary region.
+
+        Hands back the primary's async iterator directly.
+        """
+        return self.primary_saver.alist(config, filter=filter, before=before, limit=limit)
 
     # -------------------------------------------------------------------------
-    # Write Operations - Both regions (success requires both)
+    # Write Operations - Both regions (checkpoints require the primary only)
     # -------------------------------------------------------------------------
 
     def put(
@@ -118,17 +153,12 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         """
         Save a checkpoint to both regions.
         
-        Returns success only when both regions succeed.
-        Raises exception if either region fails.
+        Both writes run concurrently, but only a primary failure raises.
+        A secondary failure is logged and retried on a background thread.
         """
-        # Write to primary first
-        result = self.primary_saver.put(config, checkpoint, metadata, new_versions)
-        
-        # Write to secondary - if this fails, we have inconsistency
-        # In production, you may want to implement compensation/rollback logic
-        self.secondary_saver.put(config, checkpoint, metadata, new_versions)
-        
-        return result
+        item = (config, checkpoint, metadata, new_versions)
+        results = self._run_both(self.primary_saver.put, self.secondary_saver.put, *item)
+        return self._finish_checkpoint_write("put", results, item, self._queue_sync_retry)
 
     async def aput(
         self,
@@ -140,15 +170,27 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         """
         Async save a checkpoint to both regions.
         
-        Returns success only when both regions succeed.
+        Both writes run concurrently, but only a primary failure raises.
+        A secondary failure is logged and retried in the background, so an
+        unavailable secondary region does not fail the graph step.
         """
-        # Write to primary first
-        result = await self.primary_saver.aput(config, checkpoint, metadata, new_versions)
-        
-        # Write to secondary
-        await self.secondary_saver.aput(config, checkpoint, metadata, new_versions)
-        
-        return result
+        # Write to both regions concurrently; latency is the slower of the two
+        item = (config, checkpoint, metadata, new_versions)
+        results = await asyncio.gather(
+            self.primary_saver.aput(*item),
+            self.secondary_saver.aput(*item),
+            return_exceptions=True,
+        )
+        return self._finish_checkpoint_write("aput", results, item, self._queue_secondary_retry)
+
+    def reconcile(self) -> None:
+        """Wait until every secondary checkpoint write queued by put has been retried."""
+        self._retry_pool.submit(lambda: None).result()
+
+    async def areconcile(self) -> None:
+        """Wait until every secondary checkpoint write queued by aput has been retried."""
+        if self._reconcile_queue is not None and self._reconcile_loop is asyncio.get_running_loop():
+            await self._reconcile_queue.join()
 
     def put_writes(
         self,
@@ -160,10 +202,15 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         """
         Store intermediate writes to both regions.
         
+        The writes of one call are sent to both regions as one call each.
         Returns success only when both regions succeed.
         """
-        self.primary_saver.put_writes(config, writes, task_id, task_path)
-        self.secondary_saver.put_writes(config, writes, task_id, task_path)
+        self._run_dual_write(
+            "put_writes",
+            self.primary_saver.put_writes,
+            self.secondary_saver.put_writes,
+            config, writes, task_id, task_path,
+        )
 
     async def aput_writes(
         self,
@@ -177,8 +224,12 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         
         Returns success only when both regions succeed.
         """
-        await self.primary_saver.aput_writes(config, writes, task_id, task_path)
-        await self.secondary_saver.aput_writes(config, writes, task_id, task_path)
+        results = await asyncio.gather(
+            self.primary_saver.aput_writes(config, writes, task_id, task_path),
+            self.secondary_saver.aput_writes(config, writes, task_id, task_path),
+            return_exceptions=True,
+        )
+        self._check_dual_write("aput_writes", results)
 
     def delete_thread(self, thread_id: str, actor_id: str = "") -> None:
         """
@@ -186,8 +237,12 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         
         Returns success only when both regions succeed.
         """
-        self.primary_saver.delete_thread(thread_id, actor_id)
-        self.secondary_saver.delete_thread(thread_id, actor_id)
+        self._run_dual_write(
+            "delete_thread",
+            self.primary_saver.delete_thread,
+            self.secondary_saver.delete_thread,
+            thread_id, actor_id,
+        )
 
     async def adelete_thread(self, thread_id: str, actor_id: str = "") -> None:
         """
@@ -195,13 +250,198 @@ class MultiRegionAgentCoreMemorySaver(BaseCheckpointSaver):
         
         Returns success only when both regions succeed.
         """
-        await self.primary_saver.adelete_thread(thread_id, actor_id)
-        await self.secondary_saver.adelete_thread(thread_id, actor_id)
+        results = await asyncio.gather(
+            self.primary_saver.adelete_thread(thread_id, actor_id),
+            self.secondary_saver.adelete_thread(thread_id, actor_id),
+            return_exceptions=True,
+        )
+        self._check_dual_write("adelete_thread", results)
 
     # -------------------------------------------------------------------------
     # Utility Methods
     # -------------------------------------------------------------------------
 
+    @staticmethod
+    def _thread_key(config: RunnableConfig) -> tuple:
+        configurable = config.get("configurable", {})
+        return (configurable.get("thread_id"), configurable.get("checkpoint_ns", ""))
+
+    def _finish_checkpoint_write(
+        self, operation: str, results: Sequence[Any], item: tuple, queue_retry
+    ) -> RunnableConfig:
+        """Raise on a primary failure; queue a retry for a secondary failure."""
+        primary_result, secondary_result = results
+        if isinstance(primary_result, BaseException):
+            self._check_dual_write(operation, results)
+        if isinstance(secondary_result, BaseException):
+            logger.warning(
+                "%s failed in region %s, queued for retry: %s",
+                operation,
+                self.secondary_region,
+                secondary_result,
+            )
+            with self._replicated_lock:
+                self._retry_counts[self._thread_key(item[0])] += 1
+            queue_retry(item)
+        else:
+            self._mark_replicated(item[0], item[1])
+        return primary_result
+
+    def _mark_replicated(self, config: RunnableConfig, checkpoint: Checkpoint) -> None:
+        """Record a checkpoint written to the secondary for threads with queued retries.
+
+        Checkpoint ids are time-ordered, so only a newer id moves the mark forward.
+        """
+        key = self._thread_key(config)
+        with self._replicated_lock:
+            if key not in self._retry_counts:
+                return
+            latest = self._latest_replicated.get(key)
+            if latest is None or checkpoint["id"] > latest:
+                self._latest_replicated[key] = checkpoint["id"]
+
+    def _is_superseded(self, config: RunnableConfig, checkpoint: Checkpoint) -> bool:
+        """Check whether a newer checkpoint for the thread already reached the secondary."""
+        with self._replicated_lock:
+            latest = self._latest_replicated.get(self._thread_key(config))
+        return latest is not None and latest >= checkpoint["id"]
+
+    def _retry_finished(self, config: RunnableConfig) -> None:
+        key = self._thread_key(config)
+        with self._replicated_lock:
+            self._retry_counts[key] -= 1
+            if self._retry_counts[key] <= 0:
+                del self._retry_counts[key]
+                self._latest_replicated.pop(key, None)
+
+    def _log_retry_outcome(self, checkpoint: Checkpoint, superseded: bool) -> None:
+        if superseded:
+            logger.info(
+                "Dropping secondary retry for checkpoint %s: a newer checkpoint was replicated",
+                checkpoint["id"],
+            )
+        else:
+            logger.error(
+                "Giving up on secondary checkpoint write in region %s for checkpoint %s",
+                self.secondary_region, checkpoint["id"],
+            )
+
+    def _queue_sync_retry(self, item: tuple) -> None:
+        """Queue a failed secondary put on the single retry thread."""
+        self._retry_pool.submit(self._retry_secondary_put, item)
+
+    def _retry_secondary_put(self, item: tuple) -> None:
+        """Retry one secondary checkpoint write with exponential backoff."""
+        config, checkpoint, metadata, new_versions = item
+        delay = SECONDARY_RETRY_INITIAL_DELAY_SECONDS
+        try:
+            for attempt in range(1, SECONDARY_RETRY_MAX_ATTEMPTS + 1):
+                time.sleep(delay)
+                if self._is_superseded(config, checkpoint):
+                    self._log_retry_outcome(checkpoint, superseded=True)
+                    return
+                try:
+                    self.secondary_saver.put(config, checkpoint, metadata, new_versions)
+                except Exception as e:
+                    logger.warning(
+                        "Secondary put retry %d/%d failed in region %s: %s",
+                        attempt, SECONDARY_RETRY_MAX_ATTEMPTS, self.secondary_region, e,
+                    )
+                    delay = min(delay * 2, SECONDARY_RETRY_MAX_DELAY_SECONDS)
+                else:
+                    self._mark_replicated(config, checkpoint)
+                    return
+            self._log_retry_outcome(checkpoint, superseded=False)
+        finally:
+            self._retry_finished(config)
+
+    def _queue_secondary_retry(self, item: tuple) -> None:
+        """Queue a failed secondary aput on the running loop's drain task.
+
+        The queue and task are recreated when called from a different event
+        loop (e.g. a later asyncio.run); retries still waiting in the old
+        queue are carried over.
+        """
+        loop = asyncio.get_running_loop()
+        if self._reconcile_loop is not loop or self._reconcile_task.done():
+            old_queue = self._reconcile_queue
+            self._reconcile_loop = loop
+            self._reconcile_queue = asyncio.Queue()
+            while old_queue is not None and not old_queue.empty():
+                self._reconcile_queue.put_nowait(old_queue.get_nowait())
+            self._reconcile_task = loop.create_task(
+                self._drain_reconcile_queue(self._reconcile_queue)
+            )
+        self._reconcile_queue.put_nowait(item)
+
+    async def _drain_reconcile_queue(self, queue: asyncio.Queue) -> None:
+        """Retry queued secondary checkpoint writes with exponential backoff."""
+        while True:
+            item = await queue.get()
+            config, checkpoint, metadata, new_versions = item
+            delay = SECONDARY_RETRY_INITIAL_DELAY_SECONDS
+            try:
+                for attempt in range(1, SECONDARY_RETRY_MAX_ATTEMPTS + 1):
+                    await asyncio.sleep(delay)
+                    if self._is_superseded(config, checkpoint):
+                        self._log_retry_outcome(checkpoint, superseded=True)
+                        break
+                    try:
+                        await self.secondary_saver.aput(config, checkpoint, metadata, new_versions)
+                    except Exception as e:
+                        logger.warning(
+                            "Secondary aput retry %d/%d failed in region %s: %s",
+                            attempt, SECONDARY_RETRY_MAX_ATTEMPTS, self.secondary_region, e,
+                        )
+                        delay = min(delay * 2, SECONDARY_RETRY_MAX_DELAY_SECONDS)
+                    else:
+                        self._mark_replicated(config, checkpoint)
+                        break
+                else:
+                    self._log_retry_outcome(checkpoint, superseded=False)
+            except asyncio.CancelledError:
+                # The loop is shutting down; keep the retry for the next loop's task
+                queue.task_done()
+                queue.put_nowait(item)
+                raise
+            self._retry_finished(config)
+            queue.task_done()
+
+    def _run_both(self, primary_fn, secondary_fn, *args) -> Sequence[Any]:
+        """Run a sync call against both regions in parallel and wait for both.
+        
+        Wall time is max(primary, secondary) instead of their sum. Returns the
+        (primary, secondary) outcomes, with exceptions in place of results.
+        """
+        futures = (
+            self._pool.submit(primary_fn, *args),
+            self._pool.submit(secondary_fn, *args),
+        )
+        return [future.exception() or future.result() for future in futures]
+
+    def _run_dual_write(self, operation: str, primary_fn, secondary_fn, *args) -> Any:
+        """Run a sync write against both regions in parallel; raise if either fails."""
+        return self._check_dual_write(operation, self._run_both(primary_fn, secondary_fn, *args))
+
+    def _check_dual_write(self, operation: str, results: Sequence[Any]) -> Any:
+        """Validate the (primary, secondary) outcomes of a dual-region write.
+        
+        Logs every region that failed so compensation logic knows which side
+        is out of date, then re-raises the first failure (primary first).
+        Returns the primary result when both regions succeed.
+        """
+        regions = (self.primary_region, self.secondary_region)
+        errors = [
+            (region, outcome)
+            for region, outcome in zip(regions, results)
+            if isinstance(outcome, BaseException)
+        ]
+        for region, error in errors:
+            logger.error("%s failed in region %s: %s", operation, region, error)
+        if errors:
+            raise errors[0][1]
+        return results[0]
+
     def get_next_version(self, current: Optional[str], channel: Optional[str] = None) -> str:
         """Generate the next version ID for a channel."""
         return self.primary_saver.get_next_version(current, channel)
\ No newline at end of file
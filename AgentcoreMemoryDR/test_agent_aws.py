@@ -1,8 +1,11 @@
 import boto3
-import json
+import codecs
+import io
+import orjson
 import uuid
 import pytest
 from datetime import datetime
+from functools import cache
 from test_agent import get_memory_id, get_latest_memory_events, events_contain_text
 
 REGIONS = ["us-west-2", "eu-west-1"]
@@ -13,8 +16,14 @@ THREAD_ID = "persistence-test-fixed"
 session_id_store = {}
 memorable_code = {}
 
+_SESSION = boto3.Session()
+
+@cache
+def _client(service, region):
+    return _SESSION.client(service, region_name=region)
+
 def get_agent_runtime_arn(region):
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
+    client = _client("bedrock-agentcore-control", region)
     paginator = client.get_paginator("list_agent_runtimes")
     for page in paginator.paginate():
         for runtime in page.get("agentRuntimes", []):
@@ -23,25 +32,33 @@ def get_agent_runtime_arn(region):
     return None
 
 def stop_session(arn, session_id, region):
-    client = boto3.client("bedrock-agentcore", region_name=region)
+    client = _client("bedrock-agentcore", region)
     client.stop_runtime_session(agentRuntimeArn=arn, runtimeSessionId=session_id, qualifier="DEFAULT")
 
 def invoke_agent(arn, prompt, session_id, region):
-    client = boto3.client("bedrock-agentcore", region_name=region)
+    client = _client("bedrock-agentcore", region)
     response = client.invoke_agent_runtime(
         agentRuntimeArn=arn,
         qualifier="DEFAULT",
         runtimeSessionId=session_id,
-        payload=json.dumps({"prompt": prompt, "thread_id": THREAD_ID})
+        payload=orjson.dumps({"prompt": prompt, "thread_id": THREAD_ID})
     )
-    return "".join(event.decode("utf-8") for event in response.get("response", []))
+    decoder, buf = codecs.getincrementaldecoder("utf-8")(), io.StringIO()
+    for event in response.get("response", []):
+        buf.write(decoder.decode(event))
+    return buf.getvalue()
+
+@pytest.fixture(scope="session")
+def runtime_arns():
+    """Resolve the agent runtime ARN of every region once per test session."""
+    return {region: get_agent_runtime_arn(region) for region in REGIONS}
 
 @pytest.mark.parametrize("region", REGIONS)
 @pytest.mark.order(1)
-def test_store(region):
+def test_store(region, runtime_arns):
     global session_id_store, memorable_code
     memorable_code[region] = datetime.now().strftime(f"memorable-{region}-%Y%m%d-%H%M%S")
-    arn = get_agent_runtime_arn(region)
+    arn = runtime_arns[region]
     session_id_store[region] = f"session-{uuid.uuid4()}"
     response = invoke_agent(arn, f"My memorable code is {memorable_code[region]}. Remember this.", session_id_store[region], region)
     assert response, f"No response in {region}"
@@ -49,8 +66,8 @@ def test_store(region):
 
 @pytest.mark.parametrize("region", REGIONS)
 @pytest.mark.order(2)
-def test_recall(region):
-    arn = get_agent_runtime_arn(region)
+def test_recall(region, runtime_arns):
+    arn = runtime_arns[region]
     new_session_id = f"session-{uuid.uuid4()}"
     response = invoke_agent(arn, "What is my memorable code?", new_session_id, region)
     assert memorable_code[region] in response, f"memorable code not recalled in {region}"
@@ -1,12 +1,20 @@
-import pytest, os, boto3, uuid, json, base64, msgpack
+import pytest, os, boto3, secrets, json, base64, msgpack
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from agent import create_agent, invoke_agent
 
 REGIONS = ["us-west-2", "eu-west-1"]
 MEMORY_NAME = "dr_poc_memory"
 DEFAULT_ACTOR = "test_actor"
 
-def get_memory_id(region):
-    client = boto3.client("bedrock-agentcore-control", region_name=region)
+_SESSION = boto3.Session()
+
+@cache
+def _client(service, region):
+    return _SESSION.client(service, region_name=region)
+
+def get_memory_id(region, client=None):
+    client = client or _client("bedrock-agentcore-control", region)
     response = client.list_memories()
     for memory in response.get("memories", []):
         if memory.get("id", "").startswith(MEMORY_NAME):
@@ -19,34 +27,63 @@ def get_secondary_region(primary_region: str) -> str:
     return other_regions.pop()
 
 def get_latest_memory_events(memory_id, session_id, actor_id, region):
-    client = boto3.client("bedrock-agentcore", region_name=region)
+    client = _client("bedrock-agentcore", region)
     response = client.list_events(memoryId=memory_id, sessionId=session_id, actorId=actor_id, includePayloads=True, maxResults=10)
     return response.get("events", [])
 
+def _contains_text(obj, needle):
+    """Walk a decoded msgpack value, short-circuiting on the first string containing needle."""
+    if isinstance(obj, str):
+        return needle in obj.lower()
+    if isinstance(obj, (bytes, bytearray)):
+        return needle.encode() in obj.lower()
+    if isinstance(obj, (list, tuple)):
+        return any(_contains_text(item, needle) for item in obj)
+    if isinstance(obj, dict):
+        return any(_contains_text(value, needle) for value in obj.values())
+    return False
+
 def events_contain_text(events, text):
     """Check if any event payload blob contains the given text (decodes msgpack if needed)."""
+    text_lower = text.lower()
+    text_b = text_lower.encode()
     for event in events:
         for payload in event.get("payload", []):
             blob = payload.get("blob", "")
-            if text.lower() in blob.lower():
+            if isinstance(blob, (bytes, bytearray)):
+                if text_b in blob.lower():
+                    return True
+                blob = blob.decode("utf-8", errors="replace")
+            elif text_lower in blob.lower():
                 return True
+            # Only JSON envelopes can carry a msgpack-encoded checkpoint value
+            if not blob.lstrip().startswith("{"):
+                continue
             try:
                 data = json.loads(blob)
                 if "value" in data and isinstance(data["value"], dict) and "data" in data["value"]:
-                    decoded = msgpack.unpackb(base64.b64decode(data["value"]["data"]), raw=False)
-                    if text.lower() in str(decoded).lower():
+                    decoded = msgpack.unpackb(base64.b64decode(data["value"]["data"]), raw=False, use_list=False)
+                    if _contains_text(decoded, text_lower):
                         return True
             except Exception:
                 pass
     return False
 
+@pytest.fixture(scope="session")
+def memory_ids():
+    """Resolve the memory ID of every region once per test session, in parallel."""
+    # boto3 Sessions are not thread-safe: build the clients here, not in the workers.
+    clients = [_client("bedrock-agentcore-control", region) for region in REGIONS]
+    with ThreadPoolExecutor(max_workers=len(REGIONS)) as executor:
+        return dict(zip(REGIONS, executor.map(get_memory_id, REGIONS, clients)))
+
 @pytest.fixture(params=REGIONS)
-def agent(request):
+def agent(request, memory_ids):
     primary_region = request.param
     secondary_region = get_secondary_region(primary_region)
     
-    primary_memory_id = get_memory_id(primary_region)
-    secondary_memory_id = get_memory_id(secondary_region)
+    primary_memory_id = memory_ids[primary_region]
+    secondary_memory_id = memory_ids[secondary_region]
     
     if not primary_memory_id:
         pytest.fail(f"Memory '{MEMORY_NAME}' not found in primary region {primary_region}")
@@ -62,12 +99,12 @@ def agent(request):
 
 def test_agent_basic_response(agent):
     agent_instance, region = agent
-    response = invoke_agent(agent_instance, "Hello, my name is Alice", thread_id=f"test-basic-{uuid.uuid4().hex[:8]}", actor_id=DEFAULT_ACTOR)
+    response = invoke_agent(agent_instance, "Hello, my name is Alice", thread_id=f"test-basic-{secrets.token_hex(4)}", actor_id=DEFAULT_ACTOR)
     assert response is not None and "messages" in response and len(response["messages"]) > 0, f"Failed in {region}"
 
 def test_agent_memory_persistence(agent):
     agent_instance, region = agent
-    session_id = f"test-memory-{uuid.uuid4().hex[:8]}"
+    session_id = f"test-memory-{secrets.token_hex(4)}"
     invoke_agent(agent_instance, "I like pizza", thread_id=session_id, actor_id=DEFAULT_ACTOR)
 
     # verify the message is in memory
@@ -80,7 +117,7 @@ def test_agent_memory_persistence(agent):
 
 def test_agent_different_sessions(agent):
     agent_instance, region = agent
-    session1, session2 = f"test-diff-{uuid.uuid4().hex[:8]}", f"test-diff-{uuid.uuid4().hex[:8]}"
+    session1, session2 = f"test-diff-{secrets.token_hex(4)}", f"test-diff-{secrets.token_hex(4)}"
     invoke_agent(agent_instance, "My favorite color is blue", thread_id=session1, actor_id=DEFAULT_ACTOR)
     response = invoke_agent(agent_instance, "What is my favorite color?", thread_id=session2, actor_id=DEFAULT_ACTOR)
     assert response is not None and "messages" in response, f"Failed in {region}"
@@ -90,8 +127,8 @@ def test_recall_2nd_region(agent):
     """Verify the secret code stored via primary region is also available in the secondary region."""
     agent_instance, primary_region = agent
     secondary_region = os.environ['SECONDARY_REGION']
-    session_id = f"test-2nd-recall-{uuid.uuid4().hex[:8]}"
-    secret_code = f"SECRET-{uuid.uuid4().hex[:6].upper()}"
+    session_id = f"test-2nd-recall-{secrets.token_hex(4)}"
+    secret_code = f"SECRET-{secrets.token_hex(3).upper()}"
     
     # Store secret code via the agent (writes to both regions)
     invoke_agent(agent_instance, f"Remember this secret code: {secret_code}", thread_id=session_id, actor_id=DEFAULT_ACTOR)
@@ -106,8 +143,8 @@ def test_verify_2nd_region_memory_storage(agent):
     """Verify information stored is available in the secondary region's memory storage."""
     agent_instance, primary_region = agent
     secondary_region = os.environ['SECONDARY_REGION']
-    session_id = f"test-2nd-storage-{uuid.uuid4().hex[:8]}"
-    unique_info = f"UNIQUE-INFO-{uuid.uuid4().hex[:8]}"
+    session_id = f"test-2nd-storage-{secrets.token_hex(4)}"
+    unique_info = f"UNIQUE-INFO-{secrets.token_hex(4)}"
     
     # Store information via the agent (writes to both regions)
     invoke_agent(agent_instance, f"Please remember this important information: {unique_info}", thread_id=session_id, actor_id=DEFAULT_ACTOR)
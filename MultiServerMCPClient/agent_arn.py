@@ -0,0 +1,77 @@
+"""Cached lookup of the MCP server runtime ARN published in SSM.
+
+The ARN only changes on redeploy, so it is fetched once per process. Set
+MCP_AGENT_ARN_CACHE_TTL (seconds) to also persist it under ~/.cache and skip
+the SSM round trip on subsequent runs.
+"""
+
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import boto3
+from botocore.config import Config
+
+AGENT_ARN_PARAMETER = "/mcp_server/runtime_iam/agent_arn"
+ARN_CACHE_FILE = Path.home() / ".cache" / "mcp_agent_arn.json"
+ARN_CACHE_TTL_ENV = "MCP_AGENT_ARN_CACHE_TTL"
+
+# One session per process so the credential provider chain is walked once.
+BOTO_SESSION = boto3.Session()
+_SSM_CONFIG = Config(
+    max_pool_connections=10,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+
+def _cache_ttl() -> float:
+    try:
+        return float(os.environ.get(ARN_CACHE_TTL_ENV, 0))
+    except ValueError:
+        return 0.0
+
+
+def _read_cached_arn(region: str, ttl: float) -> str | None:
+    try:
+        entry = json.loads(ARN_CACHE_FILE.read_text())[region]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if time.time() - entry.get("fetched_at", 0) > ttl:
+        return None
+    return entry.get("arn") or None
+
+
+def _write_cached_arn(region: str, arn: str) -> None:
+    try:
+        cache = json.loads(ARN_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    cache[region] = {"arn": arn, "fetched_at": time.time()}
+    ARN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = ARN_CACHE_FILE.with_suffix(".json.tmp")
+    tmp_file.write_text(json.dumps(cache))
+    os.replace(tmp_file, ARN_CACHE_FILE)
+
+
+@lru_cache(maxsize=4)
+def get_agent_arn(region: str, ttl: float | None = None) -> str:
+    """Return the MCP server runtime ARN for `region` ("" if not published).
+
+    `ttl` (seconds) enables the on-disk cache; it defaults to MCP_AGENT_ARN_CACHE_TTL.
+    """
+    if ttl is None:
+        ttl = _cache_ttl()
+    if ttl > 0:
+        arn = _read_cached_arn(region, ttl)
+        if arn:
+            return arn
+
+    ssm_client = BOTO_SESSION.client("ssm", region_name=region, config=_SSM_CONFIG)
+    arn = ssm_client.get_parameter(Name=AGENT_ARN_PARAMETER)["Parameter"]["Value"]
+
+    if ttl > 0 and arn:
+        _write_cached_arn(region, arn)
+    return arn
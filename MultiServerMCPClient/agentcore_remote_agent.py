@@ -18,12 +18,15 @@ Response:
 from __future__ import annotations
 
 import asyncio
+import json
 import sys
+from collections import deque
 from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
 import boto3
+import httpx
 from bedrock_agentcore import BedrockAgentCoreApp
 from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_aws import ChatBedrock
@@ -38,18 +41,23 @@ for _p in (str(_repo_root), str(_this_dir)):
     if _p not in sys.path:
         sys.path.insert(0, _p)
 
-from streamable_http_sigv4 import SigV4HTTPXAuth  # noqa: E402
+from streamable_http_sigv4 import SharedAsyncTransport, SigV4HTTPXAuth  # noqa: E402
 
 
 REGION = "us-west-2"
 MODEL_ID = "anthropic.claude-3-5-sonnet-20241022-v2:0"
 SERVICE_NAME = "bedrock-agentcore"
+# Rough prompt budget (~4 chars per token) before old tool rounds are dropped.
+HISTORY_TOKEN_BUDGET = 100_000
 
 app = BedrockAgentCoreApp()
 
+# Shared boto3 session so the credential provider chain is resolved once per process.
+_boto_session = boto3.Session()
+
 
 def _create_sigv4_auth(*, region: str) -> SigV4HTTPXAuth:
-    credentials = boto3.Session().get_credentials()
+    credentials = _boto_session.get_credentials()
     if credentials is None:
         raise RuntimeError("No AWS credentials available for SigV4 signing.")
     return SigV4HTTPXAuth(
@@ -59,41 +67,112 @@ def _create_sigv4_auth(*, region: str) -> SigV4HTTPXAuth:
     )
 
 
-def _create_agent(tools, *, region: str):
-    llm = ChatBedrock(
-        model_id=MODEL_ID,
-        region_name=region,
+# One process-wide transport keeps connections to the MCP runtime warm across invocations.
+_shared_transport = SharedAsyncTransport(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=300),
+)
+
+
+def _httpx_client_factory(
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    auth: httpx.Auth | None = None,
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(60.0),
+        auth=auth,
+        follow_redirects=True,
+        transport=_shared_transport,
+    )
+
+
+# Bound LLMs keyed by (region, tool signatures), so a reconnect that re-fetches
+# identical tools does not rebuild and re-validate the tool schemas.
+_bound_llms: dict[tuple, Any] = {}
+
+
+def _bind_tools(tools, *, region: str):
+    key = (
+        region,
+        tuple(
+            (tool.name, tool.description, json.dumps(tool.args, sort_keys=True, default=str))
+            for tool in tools
+        ),
     )
-    llm_with_tools = llm.bind_tools(tools)
+    llm_with_tools = _bound_llms.get(key)
+    if llm_with_tools is None:
+        llm = ChatBedrock(
+            model_id=MODEL_ID,
+            region_name=region,
+        )
+        llm_with_tools = _bound_llms[key] = llm.bind_tools(tools)
+    return llm_with_tools
+
+
+def _approx_tokens(messages) -> int:
+    chars = 0
+    for message in messages:
+        content = message.content
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(str(part)) for part in content)
+    return chars // 4
+
+
+def _create_agent(tools, *, region: str):
+    llm_with_tools = _bind_tools(tools, region=region)
     tools_by_name = {tool.name: tool for tool in tools}
 
+    async def run_tool(tool_call) -> ToolMessage:
+        tool_name = tool_call["name"]
+        tool = tools_by_name.get(tool_name)
+        if tool is None:
+            result = f"Tool {tool_name} not found"
+        else:
+            result = await tool.ainvoke(tool_call.get("args") or {})
+        return ToolMessage(content=str(result), tool_call_id=tool_call["id"])
+
     async def agent_node(state: MessagesState):
         messages = state["messages"]
-        response = await llm_with_tools.ainvoke(messages)
-        new_messages = [response]
+        # `history` is everything produced this turn; `prompt` is what is sent to
+        # the model and drops the oldest tool rounds once it exceeds the budget.
+        history = list(messages)
+        prompt = list(messages)
+        prompt_tokens = _approx_tokens(prompt)
+        rounds: deque[tuple[int, int]] = deque()
+
+        response = await llm_with_tools.ainvoke(prompt)
 
         # Guard against runaway tool loops.
         for _ in range(12):
             if not response.tool_calls:
                 break
 
-            for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call.get("args") or {}
-                tool_id = tool_call["id"]
-
-                tool = tools_by_name.get(tool_name)
-                if tool is None:
-                    result = f"Tool {tool_name} not found"
-                else:
-                    result = await tool.ainvoke(tool_args)
-
-                new_messages.append(ToolMessage(content=str(result), tool_call_id=tool_id))
-
-            response = await llm_with_tools.ainvoke(messages + new_messages)
-            new_messages.append(response)
-
-        return {"messages": new_messages}
+            # Tool calls within one turn are independent MCP round trips; run them concurrently.
+            tool_messages = await asyncio.gather(
+                *(run_tool(tool_call) for tool_call in response.tool_calls)
+            )
+            round_messages = [response, *tool_messages]
+            history.extend(round_messages)
+
+            round_tokens = _approx_tokens(round_messages)
+            prompt.extend(round_messages)
+            prompt_tokens += round_tokens
+            rounds.append((len(round_messages), round_tokens))
+            # Keep the original input and the latest round; drop whole tool-call /
+            # tool-result groups so every ToolMessage still has its AIMessage.
+            while prompt_tokens > HISTORY_TOKEN_BUDGET and len(rounds) > 1:
+                dropped_count, dropped_tokens = rounds.popleft()
+                del prompt[len(messages):len(messages) + dropped_count]
+                prompt_tokens -= dropped_tokens
+
+            response = await llm_with_tools.ainvoke(prompt)
+
+        history.append(response)
+        return {"messages": history[len(messages):]}
 
     graph = StateGraph(MessagesState)
     graph.add_node("agent", agent_node)
@@ -102,6 +181,10 @@ def _create_agent(tools, *, region: str):
     return graph.compile()
 
 
+# SigV4 auth is built once per process; botocore's refreshable credentials keep
+# it valid, so fresh inits skip credential resolution.
+_AUTH: SigV4HTTPXAuth | None = None
+
 _init_lock = asyncio.Lock()
 _cached = {
     "client": None,
@@ -112,11 +195,20 @@ _cached = {
 
 
 async def _get_or_init() -> tuple[Any, Any]:
+    global _AUTH
+
+    # Lock-free fast path once the agent is built; only cold starts take the lock.
+    agent, region = _cached["agent"], _cached["region"]
+    if agent is not None and region is not None:
+        return agent, region
+
     async with _init_lock:
         if _cached.get("agent") is not None and _cached.get("region") is not None:
             return _cached["agent"], _cached["region"]
 
         region = REGION
+        if _AUTH is None:
+            _AUTH = _create_sigv4_auth(region=region)
         AGENTCORE_MCP_URL = "https://bedrock-agentcore.us-west-2.amazonaws.com/runtimes/arn%3Aaws%3Abedrock-agentcore%3Aus-west-2%3A482387069690%3Aruntime%2Fmcp_server_iam-rgCYhOFeIC/invocations?qualifier=DEFAULT"
 
         client = MultiServerMCPClient(
@@ -124,8 +216,9 @@ async def _get_or_init() -> tuple[Any, Any]:
                 "agentcore": {
                     "transport": "streamable_http",
                     "url": AGENTCORE_MCP_URL,
-                    "auth": _create_sigv4_auth(region=region),
+                    "auth": _AUTH,
                     "terminate_on_close": False,
+                    "httpx_client_factory": _httpx_client_factory,
                 }
             }
         )
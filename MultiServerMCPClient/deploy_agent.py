@@ -13,7 +13,7 @@ Assumptions:
 
 from __future__ import annotations
 
-import time
+import asyncio
 from pathlib import Path
 from typing import Any
 
@@ -24,6 +24,11 @@ from bedrock_agentcore_starter_toolkit.services.runtime import BedrockAgentCoreC
 REGION = "us-west-2"
 AGENT_NAME = "multiserver_mcp_agent"
 
+# Status polling backoff: start fast to catch quick updates, cap to stay off throttling.
+STATUS_POLL_INITIAL_SECONDS = 2.0
+STATUS_POLL_MAX_SECONDS = 30.0
+STATUS_POLL_BACKOFF = 1.5
+
 
 def _same_dir_path(filename: str) -> Path:
     return Path(__file__).resolve().parent / filename
@@ -36,8 +41,7 @@ def _require_file(path: Path) -> None:
         raise SystemExit(f"Expected a file but found non-file path: {path}")
 
 
-def _agent_exists() -> bool:
-    client = BedrockAgentCoreClient(REGION)
+def _agent_exists(client: BedrockAgentCoreClient) -> bool:
     found = client.find_agent_by_name(AGENT_NAME)
     if found:
         agent_id = found.get("agentRuntimeId")
@@ -51,16 +55,22 @@ def _agent_exists() -> bool:
     return False
 
 
-def main() -> int:
+async def main() -> int:
     entrypoint = _same_dir_path("agentcore_remote_agent.py")
     requirements_file = _same_dir_path("requirements.runtime.txt")
+
+    # Overlap the existence lookup with the local file checks. The client is
+    # built here because boto3 client creation is not thread-safe.
+    agent_exists = asyncio.get_running_loop().run_in_executor(
+        None, _agent_exists, BedrockAgentCoreClient(REGION)
+    )
     _require_file(entrypoint)
     _require_file(requirements_file)
-
-    auto_update_on_conflict = _agent_exists()
+    auto_update_on_conflict = await agent_exists
 
     runtime = Runtime()
-    configure_result = runtime.configure(
+    configure_result = await asyncio.to_thread(
+        runtime.configure,
         entrypoint=str(entrypoint),
         auto_create_execution_role=True,
         auto_create_ecr=True,
@@ -71,23 +81,27 @@ def main() -> int:
     )
     print("Configured:", configure_result)
 
-    launch_result = runtime.launch(auto_update_on_conflict=auto_update_on_conflict)
+    launch_result = await asyncio.to_thread(
+        runtime.launch, auto_update_on_conflict=auto_update_on_conflict
+    )
     print("Launched:")
     print("  agent_arn:", launch_result.agent_arn)
     print("  agent_id:", launch_result.agent_id)
     print("  ecr_uri:", launch_result.ecr_uri)
 
     end_status = {"READY", "CREATE_FAILED", "DELETE_FAILED", "UPDATE_FAILED"}
+    delay = STATUS_POLL_INITIAL_SECONDS
     while True:
-        status_response: Any = runtime.status()
+        status_response: Any = await asyncio.to_thread(runtime.status)
         status = status_response.endpoint.get("status")
         print("Status:", status)
         if status in end_status:
             break
-        time.sleep(10)
+        await asyncio.sleep(delay)
+        delay = min(delay * STATUS_POLL_BACKOFF, STATUS_POLL_MAX_SECONDS)
 
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(asyncio.run(main()))
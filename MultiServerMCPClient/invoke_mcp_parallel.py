@@ -3,47 +3,102 @@ import asyncio
 import sys
 import time
 
-import boto3
-from boto3.session import Session
-from mcp import ClientSession
+from mcp import ClientSession, types
 
+from agent_arn import BOTO_SESSION, get_agent_arn
+from event_loop import run
+from mcp_url import mcp_url
 from streamable_http_sigv4 import streamablehttp_client_with_sigv4
+from timings import format_timings, start_timings, timed
 
 
-async def main(operation: str = "add_numbers", thread_count: int = 1) -> None:
-    boto_session = Session()
-    region = boto_session.region_name
+# Operations with a server-side `<operation>_batch` tool taking {"items": [args, ...]}.
+# The batch tools only exist once the server is redeployed from the updated notebook.
+BATCH_TOOLS = {"add_numbers", "multiply_numbers"}
+BATCH_THRESHOLD = 4
 
-    ssm_client = boto3.client("ssm", region_name=region)
-    agent_arn_response = ssm_client.get_parameter(Name="/mcp_server/runtime_iam/agent_arn")
-    agent_arn = agent_arn_response["Parameter"]["Value"]
+
+async def _bounded_call(sem: asyncio.Semaphore, session: ClientSession, operation: str, args: dict):
+    async with sem:
+        with timed("call_tool"):
+            return await session.call_tool(operation, args)
+
+
+async def bounded_call_tool(
+    session: ClientSession,
+    operation: str,
+    arguments_list: list[dict],
+    max_concurrency: int,
+) -> list[types.CallToolResult]:
+    """Run one tools/call per argument dict, at most `max_concurrency` in flight, returning results in order.
+
+    The window slides: each finished call immediately frees a slot for the next
+    request, so one slow call never holds back the rest.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(_bounded_call(sem, session, operation, arguments))
+            for arguments in arguments_list
+        ]
+    return [task.result() for task in tasks]
+
+
+async def main(
+    operation: str = "add_numbers",
+    thread_count: int = 1,
+    max_concurrency: int | None = None,
+    batch: bool = False,
+) -> None:
+    # Installed before the transport starts so its background tasks share the buckets
+    buckets = start_timings()
+
+    region = BOTO_SESSION.region_name
+    agent_arn = get_agent_arn(region)
 
     if not agent_arn:
         print("Error: AGENT_ARN not found")
         sys.exit(1)
 
-    encoded_arn = agent_arn.replace(":", "%3A").replace("/", "%2F")
-    mcp_url = (
-        f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
-    )
-
     async with streamablehttp_client_with_sigv4(
-        url=mcp_url,
-        credentials=boto3.Session().get_credentials(),
+        url=mcp_url(region, agent_arn),
+        credentials=BOTO_SESSION.get_credentials(),
         service="bedrock-agentcore",
         region=region,
         terminate_on_close=False,
+        max_connections=max(thread_count, 64),
+        max_keepalive=min(thread_count, 64),
     ) as (read_stream, write_stream, _):
         async with ClientSession(read_stream, write_stream) as session:
             await session.initialize()
+            # Warm the connection (TLS, HTTP/2 preface, signing key) outside the timed section
+            await session.send_ping()
 
             n = thread_count
-            start = time.perf_counter()
-            results = await asyncio.gather(
-                *(session.call_tool(operation, {"a": 6, "b": 7}) for _ in range(n))
-            )
-            duration_s = time.perf_counter() - start
+            args = {"a": 6, "b": 7}
+            if batch and operation in BATCH_TOOLS and n > BATCH_THRESHOLD:
+                # Identical arguments: one batched round trip instead of n.
+                buckets.clear()
+                start = time.perf_counter_ns()
+                with timed("call_tool"):
+                    result = await session.call_tool(f"{operation}_batch", {"items": [args] * n})
+                duration_s = (time.perf_counter_ns() - start) / 1e9
+                if result.isError:
+                    print(f"Error: {operation}_batch failed:", result.content)
+                    sys.exit(1)
+                print(f"Completed {n} batched {operation} calls in {duration_s:.2f}s")
+                print("Timings:", format_timings(buckets))
+                print("Results:", result.structuredContent or result.content)
+                return
+
+            # Keep in-flight calls within the httpx pool to avoid PoolTimeout at large n.
+            max_in_flight = max_concurrency or min(n, 64)
+            buckets.clear()
+            start = time.perf_counter_ns()
+            results = await bounded_call_tool(session, operation, [args] * n, max_in_flight)
+            duration_s = (time.perf_counter_ns() - start) / 1e9
             print(f"Completed {n} parallel {operation} calls in {duration_s:.2f}s")
+            print("Timings:", format_timings(buckets))
             print("Results:", [r.structuredContent or r.content for r in results])
 
 
@@ -61,9 +116,30 @@ if __name__ == "__main__":
         default=1,
         help="Number of parallel calls (default: 1)",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Maximum in-flight calls (default: min(thread-count, 64))",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            f"Send more than {BATCH_THRESHOLD} identical calls as one `<operation>_batch` call "
+            "(requires a server deployed with the batch tools)"
+        ),
+    )
     args = parser.parse_args()
     
-    asyncio.run(main(operation=args.operation, thread_count=args.thread_count))
+    run(
+        main(
+            operation=args.operation,
+            thread_count=args.thread_count,
+            max_concurrency=args.max_concurrency,
+            batch=args.batch,
+        )
+    )
 
 
 #python invoke_mcp_parallel.py --operation add_numbers --thread-count 2
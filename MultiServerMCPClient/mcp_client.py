@@ -1,8 +1,8 @@
-import asyncio
-
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
+from event_loop import run
+
 async def main():
     mcp_url = "http://localhost:8000/mcp"
     headers = {}
@@ -20,4 +20,4 @@ async def main():
                 print(f"  - {tool.name}: {tool.description}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,10 +1,12 @@
 import asyncio
 import sys
 import logging
-import boto3
-from boto3.session import Session
-from mcp import ClientSession
+from collections.abc import AsyncIterator
+from mcp import ClientSession, types
 from mcp.client.streamable_http import streamablehttp_client
+from agent_arn import BOTO_SESSION, get_agent_arn
+from event_loop import run
+from mcp_url import mcp_url
 from streamable_http_sigv4 import streamablehttp_client_with_sigv4
 
 
@@ -39,10 +41,9 @@ def create_streamable_http_transport_sigv4(
         ...     region="us-west-2"
         ... )
     """
-    # Get AWS credentials from the current boto3 session
+    # Get AWS credentials from the shared boto3 session
     # These credentials will be used to sign requests with SigV4
-    session = boto3.Session()
-    credentials = session.get_credentials()
+    credentials = BOTO_SESSION.get_credentials()
 
     # Create and return the custom transport with SigV4 signing capability
     return streamablehttp_client_with_sigv4(
@@ -53,69 +54,56 @@ def create_streamable_http_transport_sigv4(
     )
 
 
-def get_full_tools_list(client):
+async def get_full_tools_list(session: ClientSession) -> AsyncIterator[types.Tool]:
     """
-    Retrieve the complete list of tools from an MCP client, handling pagination.
+    Iterate over every tool exposed by an MCP session, handling pagination.
 
-    MCP servers may return tools in paginated responses. This function handles the
-    pagination automatically and returns all available tools in a single list.
+    MCP servers may return tools in paginated responses. Page tokens are opaque,
+    so pages cannot be fetched in parallel, but the next page is requested while
+    the caller is still consuming the current one.
 
     Args:
-        client: An MCP client instance (from strands.tools.mcp.mcp_client.MCPClient)
+        session: An initialized MCP ClientSession
 
-    Returns:
-        list: A complete list of all tools available from the MCP server
+    Yields:
+        types.Tool: Each tool available from the MCP server
 
     Example:
-        >>> mcp_client = MCPClient(lambda: create_transport())
-        >>> all_tools = get_full_tools_list(mcp_client)
-        >>> print(f"Found {len(all_tools)} tools")
+        >>> async for tool in get_full_tools_list(session):
+        ...     print(tool.name)
     """
-    more_tools = True
-    tools = []
-    pagination_token = None
-
-    # Loop until we've fetched all pages
-    while more_tools:
-        tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
-
-        tools.extend(tmp_tools)
-
-        # Check if there are more pages to fetch
-        if tmp_tools.pagination_token is None:
-            # No more pages - we're done
-            more_tools = False
-        else:
-            # More pages exist - prepare to fetch the next one
-            more_tools = True
-            pagination_token = tmp_tools.pagination_token
-
-    return tools
+    result = await session.list_tools()
+    while True:
+        next_page = None
+        if result.nextCursor is not None:
+            # Prefetch the next page while this one is being consumed
+            next_page = asyncio.create_task(session.list_tools(cursor=result.nextCursor))
+        try:
+            for tool in result.tools:
+                yield tool
+        except BaseException:
+            if next_page is not None:
+                next_page.cancel()
+            raise
+        if next_page is None:
+            return
+        result = await next_page
 
 
 async def main():
-    boto_session = Session()
-    region = boto_session.region_name
+    region = BOTO_SESSION.region_name
     print(f"Using AWS region: {region}")
 
-    ssm_client = boto3.client("ssm", region_name=region)
-
-    agent_arn_response = ssm_client.get_parameter(
-        Name="/mcp_server/runtime_iam/agent_arn"
-    )
-    agent_arn = agent_arn_response["Parameter"]["Value"]
+    agent_arn = get_agent_arn(region)
     print(f"Retrieved Agent ARN: {agent_arn}")
 
     if not agent_arn:
         print("❌ Error: AGENT_ARN not found")
         sys.exit(1)
 
-    encoded_arn = agent_arn.replace(":", "%3A").replace("/", "%2F")
-    mcp_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
-
     try:
         async with create_streamable_http_transport_sigv4(
-            mcp_url=mcp_url, service_name="bedrock-agentcore", region=region
+            mcp_url=mcp_url(region, agent_arn), service_name="bedrock-agentcore", region=region
         ) as (
             read_stream,
             write_stream,
@@ -127,11 +115,11 @@ async def main():
                 print("✓ MCP session initialized")
 
                 print("\n🔄 Listing available tools...")
-                tool_result = await session.list_tools()
-
                 print("\n📋 Available MCP Tools:")
                 print("=" * 50)
-                for tool in tool_result.tools:
+                tool_count = 0
+                async for tool in get_full_tools_list(session):
+                    tool_count += 1
                     print(f"🔧 {tool.name}")
                     print(f"   Description: {tool.description}")
                     if hasattr(tool, "inputSchema") and tool.inputSchema:
@@ -141,7 +129,7 @@ async def main():
                     print()
 
                 print(f"✅ Successfully connected to MCP server!")
-                print(f"Found {len(tool_result.tools)} tools available.")
+                print(f"Found {tool_count} tools available.")
 
     except Exception as e:
         print(f"❌ Error connecting to MCP server: {e}")
@@ -153,4 +141,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
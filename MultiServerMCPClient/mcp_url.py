@@ -0,0 +1,13 @@
+"""Invocation URL for an MCP server hosted on AgentCore Runtime."""
+
+from functools import lru_cache
+from urllib.parse import quote
+
+
+@lru_cache(maxsize=8)
+def mcp_url(region: str, agent_arn: str, qualifier: str = "DEFAULT") -> str:
+    """Return the runtime invocation URL, percent-encoding the whole ARN as one path segment."""
+    return (
+        f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/"
+        f"{quote(agent_arn, safe='')}/invocations?qualifier={qualifier}"
+    )
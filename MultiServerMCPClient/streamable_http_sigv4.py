@@ -5,11 +5,14 @@ This module extends the MCP StreamableHTTPTransport to add AWS SigV4 request sig
 for authentication with MCP servers that authenticate using AWS IAM.
 """
 
+import hmac
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import timedelta
-from typing import Generator
+from hashlib import sha256
+from typing import Any, Generator
 
+import anyio
 import httpx
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from botocore.auth import SigV4Auth
@@ -20,8 +23,163 @@ from mcp.client.streamable_http import (
     StreamableHTTPTransport,
     streamablehttp_client,
 )
-from mcp.shared._httpx_utils import McpHttpClientFactory, create_mcp_http_client
+from mcp.shared._httpx_utils import McpHttpClientFactory
 from mcp.shared.message import SessionMessage
+from timings import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class _OrjsonAsyncClient(httpx.AsyncClient):
+    """AsyncClient that serializes `json=` request bodies with orjson.
+
+    The MCP transport posts every JSON-RPC envelope via `json=`, which httpx
+    encodes with the stdlib `json` module. Responses are already parsed by
+    pydantic-core, so only the request side is swapped.
+    """
+
+    def build_request(self, method, url, *, content=None, json=None, headers=None, **kwargs):
+        if json is not None and content is None and orjson is not None:
+            content = orjson.dumps(json)
+            json = None
+            headers = httpx.Headers(headers)
+            headers.setdefault("Content-Type", "application/json")
+        return super().build_request(
+            method, url, content=content, json=json, headers=headers, **kwargs
+        )
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        # Includes SigV4 signing; ends when response headers arrive
+        with timed("http_send"):
+            return await super().send(request, **kwargs)
+
+
+class SharedAsyncTransport(httpx.AsyncHTTPTransport):
+    """Connection-pooling transport that outlives the per-session httpx clients.
+
+    The MCP streamable HTTP transport opens (and closes) its own AsyncClient for
+    every session. Backing those clients with one shared transport keeps TCP/TLS
+    connections warm across sessions and servers; call `close()` when done.
+    """
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Keep the pool open when a session's client exits its context."""
+
+    async def aclose(self) -> None:
+        """Ignore per-client closes; the pool is released by `close()`."""
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await super().aclose()
+
+
+def shared_transport_client_factory(transport: httpx.AsyncBaseTransport) -> McpHttpClientFactory:
+    """Build an httpx client factory whose clients all send through `transport`."""
+
+    def factory(
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        return _OrjsonAsyncClient(
+            headers=headers,
+            timeout=timeout or httpx.Timeout(30.0, read=300.0),
+            auth=auth,
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    return factory
+
+
+def pooled_http_client_factory(
+    max_connections: int = 256,
+    max_keepalive: int = 64,
+    keepalive_expiry: float = 30.0,
+) -> McpHttpClientFactory:
+    """Build an httpx client factory with an HTTP/2, explicitly sized connection pool.
+
+    httpx's default pool (100 connections) raises PoolTimeout once parallel tool
+    calls exceed it; HTTP/2 lets those calls share a few multiplexed connections.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+    def factory(
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        return _OrjsonAsyncClient(
+            headers=headers,
+            timeout=timeout or httpx.Timeout(30.0, read=300.0),
+            auth=auth,
+            follow_redirects=True,
+            http2=True,
+            limits=limits,
+        )
+
+    return factory
+
+
+CLEANUP_TIMEOUT_SECONDS = 5.0
+
+_SIGV4_HEADERS = ("Authorization", "X-Amz-Date", "X-Amz-Security-Token", "X-Amz-Content-SHA256")
+
+
+def _derive_signing_key(secret_key: str, date_stamp: str, region: str, service: str) -> bytes:
+    """Derive the SigV4 signing key; it only changes per day, region, and service."""
+    key = f"AWS4{secret_key}".encode()
+    for part in (date_stamp, region, service, "aws4_request"):
+        key = hmac.new(key, part.encode("utf-8"), sha256).digest()
+    return key
+
+
+class _CachedSigV4Auth(SigV4Auth):
+    """SigV4 signer that reuses per-endpoint work across requests.
+
+    MCP traffic targets a single invocation URL, so its canonical query string
+    is computed once and looked up afterwards. The derived signing key is kept
+    on the instance for the current (secret digest, date), leaving one HMAC
+    per request; the raw secret is never used as a cache key.
+    """
+
+    _MAX_CACHED_URLS = 64
+
+    def __init__(self, credentials: Credentials, service: str, region: str):
+        super().__init__(credentials, service, region)
+        self._query_strings: dict[str, str] = {}
+        # ((sha256 of secret key, date stamp), derived signing key)
+        self._signing_key_entry: tuple[tuple[bytes, str], bytes] | None = None
+
+    def canonical_query_string(self, request: AWSRequest) -> str:
+        if request.params:
+            return super().canonical_query_string(request)
+        query_string = self._query_strings.get(request.url)
+        if query_string is None:
+            query_string = super().canonical_query_string(request)
+            if len(self._query_strings) < self._MAX_CACHED_URLS:
+                self._query_strings[request.url] = query_string
+        return query_string
+
+    def signature(self, string_to_sign: str, request: AWSRequest) -> str:
+        secret_key = self.credentials.secret_key
+        date_stamp = request.context["timestamp"][0:8]
+        # Refreshed credentials or a new day change the id and re-derive the key
+        key_id = (sha256(secret_key.encode("utf-8")).digest(), date_stamp)
+        entry = self._signing_key_entry
+        if entry is None or entry[0] != key_id:
+            signing_key = _derive_signing_key(
+                secret_key, date_stamp, self._region_name, self._service_name
+            )
+            entry = self._signing_key_entry = (key_id, signing_key)
+        return hmac.new(entry[1], string_to_sign.encode("utf-8"), sha256).hexdigest()
 
 
 class SigV4HTTPXAuth(httpx.Auth):
@@ -36,31 +194,34 @@ class SigV4HTTPXAuth(httpx.Auth):
         self.credentials = credentials
         self.service = service
         self.region = region
-        self.signer = SigV4Auth(credentials, service, region)
+        self.signer = _CachedSigV4Auth(credentials, service, region)
 
     def auth_flow(
         self, request: httpx.Request
     ) -> Generator[httpx.Request, httpx.Response, None]:
         """Signs the request with SigV4 and adds the signature to the request headers."""
 
-        # Create an AWS request
-        headers = dict(request.headers)
-        # Header 'connection' = 'keep-alive' is not used in calculating the request
-        # signature on the server-side, and results in a signature mismatch if included
-        headers.pop("connection", None)  # Remove if present, ignore if not
+        with timed("sigv4"):
+            # Create an AWS request
+            # Header 'connection' = 'keep-alive' is not used in calculating the request
+            # signature on the server-side, and results in a signature mismatch if included
+            headers = {k: v for k, v in request.headers.items() if k != "connection"}
 
-        aws_request = AWSRequest(
-            method=request.method,
-            url=str(request.url),
-            data=request.content,
-            headers=headers,
-        )
+            aws_request = AWSRequest(
+                method=request.method,
+                url=str(request.url),
+                data=request.content,
+                headers=headers,
+            )
 
-        # Sign the request with SigV4
-        self.signer.add_auth(aws_request)
+            # Sign the request with SigV4
+            self.signer.add_auth(aws_request)
 
-        # Add the signature header to the original request
-        request.headers.update(dict(aws_request.headers))
+            # Copy back only the headers SigV4 adds; everything else is unchanged
+            for name in _SIGV4_HEADERS:
+                value = aws_request.headers.get(name)
+                if value is not None:
+                    request.headers[name] = value
 
         yield request
 
@@ -118,7 +279,9 @@ async def streamablehttp_client_with_sigv4(
     timeout: float | timedelta = 30,
     sse_read_timeout: float | timedelta = 60 * 5,
     terminate_on_close: bool = True,
-    httpx_client_factory: McpHttpClientFactory = create_mcp_http_client,
+    httpx_client_factory: McpHttpClientFactory | None = None,
+    max_connections: int = 256,
+    max_keepalive: int = 64,
 ) -> AsyncGenerator[
     tuple[
         MemoryObjectReceiveStream[SessionMessage | Exception],
@@ -133,20 +296,38 @@ async def streamablehttp_client_with_sigv4(
     This transport enables communication with MCP servers that authenticate using AWS IAM,
     such as servers behind a Lambda function URL or API Gateway.
 
+    Unless `httpx_client_factory` is given, requests go through an HTTP/2 client
+    whose pool is sized by `max_connections` / `max_keepalive`.
+
     Yields:
         Tuple containing:
             - read_stream: Stream for reading messages from the server
             - write_stream: Stream for sending messages to the server
             - get_session_id_callback: Function to retrieve the current session ID
     """
+    if httpx_client_factory is None:
+        httpx_client_factory = pooled_http_client_factory(
+            max_connections=max_connections,
+            max_keepalive=max_keepalive,
+        )
 
-    async with streamablehttp_client(
-        url=url,
-        headers=headers,
-        timeout=timeout,
-        sse_read_timeout=sse_read_timeout,
-        terminate_on_close=terminate_on_close,
-        httpx_client_factory=httpx_client_factory,
-        auth=SigV4HTTPXAuth(credentials, service, region),
-    ) as result:
-        yield result
+    async with AsyncExitStack() as stack:
+        result = await stack.enter_async_context(
+            streamablehttp_client(
+                url=url,
+                headers=headers,
+                timeout=timeout,
+                sse_read_timeout=sse_read_timeout,
+                terminate_on_close=terminate_on_close,
+                httpx_client_factory=httpx_client_factory,
+                auth=SigV4HTTPXAuth(credentials, service, region),
+            )
+        )
+        try:
+            yield result
+        finally:
+            # Shield teardown so a cancelled caller still terminates the session and
+            # releases pooled connections, bounded so a dead peer cannot hang exit.
+            # Must run in the task that entered the context (anyio cancel scopes).
+            with anyio.move_on_after(CLEANUP_TIMEOUT_SECONDS, shield=True):
+                await stack.aclose()
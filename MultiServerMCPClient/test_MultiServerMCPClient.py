@@ -2,35 +2,46 @@
 LangGraph agent using MultiServerMCPClient with AWS SigV4 authentication.
 """
 
+import argparse
 import asyncio
 import datetime
+import json
 import sys
 import uuid
-import boto3
-from contextlib import AsyncExitStack
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from langchain_aws import ChatBedrock
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_mcp_adapters.tools import load_mcp_tools
-from langgraph.graph import StateGraph, MessagesState, START, END
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-# Import the SigV4 auth class from the existing module
-from streamable_http_sigv4 import SigV4HTTPXAuth
+from agent_arn import BOTO_SESSION, get_agent_arn
+from event_loop import run
+from mcp_url import mcp_url
 
+# LangChain / LangGraph / MCP imports are deferred to the functions that use
+# them; importing them up front costs most of a second before main() runs.
+if TYPE_CHECKING:
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    from streamable_http_sigv4 import SigV4HTTPXAuth
 
-region = "us-west-2"
-ssm_client = boto3.client("ssm", region_name=region)
-agent_arn_response = ssm_client.get_parameter(Name="/mcp_server/runtime_iam/agent_arn")
-agent_arn = agent_arn_response["Parameter"]["Value"]
-encoded_arn = agent_arn.replace(":", "%3A").replace("/", "%2F")
-AGENTCORE_MCP_URL = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
 
 REGION = "us-west-2"
+# Idle ping interval for long-lived sessions; below the shared pool's 30s keepalive expiry
+SESSION_KEEPALIVE_SECONDS = 25.0
 
 
-def create_sigv4_auth():
-    """Create SigV4 auth handler for AWS-authenticated MCP servers."""
-    credentials = boto3.Session().get_credentials()
+def agentcore_mcp_url() -> str:
+    """Resolve the MCP server URL on first use rather than at import time."""
+    # Served from ~/.cache for an hour so repeated runs skip the SSM round trip
+    return mcp_url(REGION, get_agent_arn(REGION, ttl=3600))
+
+
+@lru_cache(maxsize=1)
+def _sigv4_auth() -> "SigV4HTTPXAuth":
+    # Import the SigV4 auth class from the existing module
+    from streamable_http_sigv4 import SigV4HTTPXAuth
+
+    # Resolved once; refreshable credentials re-fetch themselves when they expire,
+    # and the signer reads them on every request
+    credentials = BOTO_SESSION.get_credentials()
     return SigV4HTTPXAuth(
         credentials=credentials,
         service="bedrock-agentcore",
@@ -38,47 +49,94 @@ def create_sigv4_auth():
     )
 
 
+def create_sigv4_auth():
+    """Create SigV4 auth handler for AWS-authenticated MCP servers."""
+    return _sigv4_auth()
+
+
+# Bound LLMs keyed by tool signatures, so runners that load the same tools
+# reuse one client and one converted tool schema.
+_bound_llms: dict[tuple, object] = {}
+
+
+def _bind_tools(tools):
+    from langchain_aws import ChatBedrock
+
+    key = tuple(
+        sorted(
+            (tool.name, tool.description, json.dumps(tool.args, sort_keys=True, default=str))
+            for tool in tools
+        )
+    )
+    llm_with_tools = _bound_llms.get(key)
+    if llm_with_tools is None:
+        llm = ChatBedrock(
+            model_id="anthropic.claude-3-5-sonnet-20241022-v2:0",
+            region_name=REGION,
+        )
+        llm_with_tools = _bound_llms[key] = llm.bind_tools(tools)
+    return llm_with_tools
+
+
 def create_agent(tools):
     """Create a LangGraph agent with one node that handles tool calls."""
-    llm = ChatBedrock(
-        model_id="anthropic.claude-3-5-sonnet-20241022-v2:0",
-        region_name=REGION,
-    )
-    llm_with_tools = llm.bind_tools(tools)
-    tools_by_name = {tool.name: tool for tool in tools}
+    from langchain_core.messages import ToolMessage
+    from langgraph.graph import END, START, MessagesState, StateGraph
+
+    llm_with_tools = _bind_tools(tools)
+    # Bound methods resolved once, not per tool call
+    tools_ainvoke = {tool.name: tool.ainvoke for tool in tools}
+    # Cap concurrent tool calls so a wide fan-out cannot exhaust the HTTP pool
+    tool_semaphore = asyncio.Semaphore(8)
+
+    async def run_tool(ainvoke, tool_name, tool_args):
+        if ainvoke is None:
+            return f"Tool {tool_name} not found"
+        async with tool_semaphore:
+            return await ainvoke(tool_args)
     
     async def agent_node(state: MessagesState):
         """Single node that calls LLM and executes tools."""
         messages = state["messages"]
         
+        # One growing conversation instead of re-concatenating every turn
+        conversation = list(messages)
+
         # Call LLM
-        response = await llm_with_tools.ainvoke(messages)
-        new_messages = [response]
+        response = await llm_with_tools.ainvoke(conversation)
+        conversation.append(response)
         
         # If LLM wants to use tools, execute them
         while response.tool_calls:
-            for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id = tool_call["id"]
-                
+            # One pass over the tool calls: (id, name, args, bound ainvoke)
+            calls = [
+                (tc["id"], tc["name"], tc["args"], tools_ainvoke.get(tc["name"]))
+                for tc in response.tool_calls
+            ]
+            for _, tool_name, tool_args, _ in calls:
                 print(f"   🔧 Calling {tool_name}({tool_args})")
-                
-                # Execute tool
-                tool = tools_by_name.get(tool_name)
-                if tool:
-                    result = await tool.ainvoke(tool_args)
-                    print(f"   ✅ Result: {result}")
+
+            # Tool calls in one turn are independent; run them concurrently. A failing
+            # tool becomes an error result for the model instead of aborting the turn
+            results = await asyncio.gather(
+                *(run_tool(ainvoke, tool_name, tool_args) for _, tool_name, tool_args, ainvoke in calls),
+                return_exceptions=True,
+            )
+
+            # Print after the gather so concurrent output does not interleave
+            for (tool_id, _, _, _), result in zip(calls, results):
+                if isinstance(result, Exception):
+                    print(f"   ❌ Error: {result}")
+                    result = f"Error: {result}"
                 else:
-                    result = f"Tool {tool_name} not found"
-                
-                new_messages.append(ToolMessage(content=str(result), tool_call_id=tool_id))
+                    print(f"   ✅ Result: {result}")
+                conversation.append(ToolMessage(content=str(result), tool_call_id=tool_id))
             
             # Call LLM again with tool results
-            response = await llm_with_tools.ainvoke(messages + new_messages)
-            new_messages.append(response)
+            response = await llm_with_tools.ainvoke(conversation)
+            conversation.append(response)
         
-        return {"messages": new_messages}
+        return {"messages": conversation[len(messages):]}
     
     # Build graph with single node
     graph = StateGraph(MessagesState)
@@ -89,97 +147,201 @@ def create_agent(tools):
     return graph.compile()
 
 
-async def run_agent_with_prompts_single_session(client: MultiServerMCPClient, prompts: list[str]):
+async def load_session_tools(client: "MultiServerMCPClient", session, server_name: str):
+    """Load MCP tools pinned to an already-open session.
+
+    Tools loaded with a session call `session.call_tool` on the existing
+    read/write streams. Tools from `client.get_tools()` open and close a fresh
+    session (and HTTP connection) on every invocation instead.
+    """
+    from langchain_mcp_adapters.tools import load_mcp_tools
+
+    return await load_mcp_tools(
+        session,
+        callbacks=client.callbacks,
+        tool_interceptors=client.tool_interceptors,
+        server_name=server_name,
+    )
+
+
+async def run_prompts(agent, prompts: list[str], max_concurrency: int = 3):
+    """Run independent prompts concurrently and print the answers in prompt order.
+
+    MCP sessions multiplex concurrent requests by JSON-RPC id, so prompts can
+    share a session; the semaphore keeps Bedrock request rate bounded.
+    """
+    from langchain_core.messages import HumanMessage
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(prompt: str) -> str:
+        async with semaphore:
+            result = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
+        return result["messages"][-1].content
+
+    final_responses = await asyncio.gather(*(run_one(prompt) for prompt in prompts))
+
+    for prompt, final_response in zip(prompts, final_responses):
+        print(f"\n{'='*60}")
+        print(f"🧑 User: {prompt}")
+        print("-" * 40)
+        print(f"🤖 Agent: {final_response}")
+
+
+async def run_agent_with_prompts_single_session(client: "MultiServerMCPClient", prompts: list[str]):
     async with client.session(server_name="agentcore1") as session:
-        tools = await load_mcp_tools(
-            session,
-            callbacks=client.callbacks,
-            tool_interceptors=client.tool_interceptors,
-            server_name="agentcore1",
-        )
+        tools = await load_session_tools(client, session, "agentcore1")
         print(f"\n📋 Loaded {len(tools)} tools: {[t.name for t in tools]}")
 
         agent = create_agent(tools)
 
-        for prompt in prompts:
-            print(f"\n{'='*60}")
-            print(f"🧑 User: {prompt}")
-            print("-" * 40)
+        await run_prompts(agent, prompts)
 
-            result = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
-            final_response = result["messages"][-1].content
-            print(f"🤖 Agent: {final_response}")
-
-async def run_agent_without_session(client: MultiServerMCPClient, prompts: list[str]):
+async def run_agent_without_session(client: "MultiServerMCPClient", prompts: list[str]):
 
     tools = await client.get_tools()
     print(f"\n📋 Loaded {len(tools)} tools: {[t.name for t in tools]}")
 
     agent = create_agent(tools)
 
-    for prompt in prompts:
-        print(f"\n{'='*60}")
-        print(f"🧑 User: {prompt}")
-        print("-" * 40)
+    await run_prompts(agent, prompts)
 
-        result = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
-        final_response = result["messages"][-1].content
-        print(f"🤖 Agent: {final_response}")
+async def _hold_session(
+    client: "MultiServerMCPClient",
+    server_name: str,
+    tools_ready: asyncio.Future,
+    done: asyncio.Event,
+):
+    """Open a session, publish its tools, and keep it open until `done` is set.
 
-async def run_agent_with_prompts_multi_server(client: MultiServerMCPClient, prompts: list[str]):
+    Entering and exiting happen in this one task, as the transport's anyio
+    cancel scopes require, so several servers can be brought up concurrently.
     """
-    Run agent with explicit session management for all configured servers.
+    print(f"   🔌 Connecting to '{server_name}'...")
+    async with client.session(server_name=server_name) as session:
+        tools = await load_session_tools(client, session, server_name)
+        print(f"   ✅ Loaded {len(tools)} tools from '{server_name}': {[t.name for t in tools]}")
+        tools_ready.set_result(tools)
+
+        # Off the hot path: ping while idle so pooled connections stay warm and a
+        # dead session surfaces here rather than on the next tool call
+        while not done.is_set():
+            try:
+                await asyncio.wait_for(done.wait(), timeout=SESSION_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                try:
+                    await session.send_ping()
+                except Exception as e:
+                    print(f"   ⚠️ Keepalive ping to '{server_name}' failed: {e}")
+
+
+@asynccontextmanager
+async def open_all_sessions(client: "MultiServerMCPClient"):
+    """Open an explicit session per configured server concurrently and yield all their tools.
+
+    Each server's session lives in its own task so connect + initialize +
+    list_tools overlap across servers; a failure in any one cancels the rest.
+    Sessions stay open until the block exits.
+    """
+    server_names = list(client.connections.keys())
+    print(f"\n🌐 Opening explicit sessions for {len(server_names)} servers: {server_names}")
+
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+    async with asyncio.TaskGroup() as tg:
+        tools_ready = [loop.create_future() for _ in server_names]
+        for server_name, ready in zip(server_names, tools_ready):
+            tg.create_task(_hold_session(client, server_name, ready, done))
+
+        try:
+            all_tools = [tool for tools in await asyncio.gather(*tools_ready) for tool in tools]
+            print(f"\n📋 Total tools loaded: {len(all_tools)}")
+            yield all_tools
+        finally:
+            done.set()
+
+
+async def run_agent_with_prompts_multi_server(client: "MultiServerMCPClient", prompts: list[str]):
+    """Run agent with explicit session management for all configured servers.
+
     This is the most efficient approach per session_behavior_analysis.md:
     - Uses explicit sessions (not headers)
     - Minimizes invocations (~6 vs ~15)
     - All servers maintain their sessions throughout execution
     """
-    server_names = list(client.connections.keys())
-    print(f"\n🌐 Opening explicit sessions for {len(server_names)} servers: {server_names}")
-    
-    # Use AsyncExitStack to manage multiple session contexts simultaneously
-    async with AsyncExitStack() as stack:
-        all_tools = []
-        
-        # Open an explicit session for each server - most efficient approach
-        for server_name in server_names:
-            print(f"   🔌 Connecting to '{server_name}'...")
-            session = await stack.enter_async_context(client.session(server_name=server_name))
-            tools = await load_mcp_tools(
-                session,
-                callbacks=client.callbacks,
-                tool_interceptors=client.tool_interceptors,
-                server_name=server_name,
-            )
-            print(f"   ✅ Loaded {len(tools)} tools from '{server_name}': {[t.name for t in tools]}")
-            all_tools.extend(tools)
-        
-        print(f"\n📋 Total tools loaded: {len(all_tools)}")
+    async with open_all_sessions(client) as all_tools:
         print("📌 All sessions are now active and will remain open for all prompts")
 
         agent = create_agent(all_tools)
 
-        # Execute all prompts with sessions maintained throughout
-        for prompt in prompts:
-            print(f"\n{'='*60}")
-            print(f"🧑 User: {prompt}")
-            print("-" * 40)
-
-            result = await agent.ainvoke({"messages": [HumanMessage(content=prompt)]})
-            final_response = result["messages"][-1].content
-            print(f"🤖 Agent: {final_response}")
+        await run_prompts(agent, prompts)
         
         print(f"\n🏁 All prompts completed. Sessions will now close.")
 
-async def main():
+
+BATCHED_SYSTEM_PROMPT = (
+    "You will receive several numbered, independent questions. Answer each one, "
+    "numbering your answers to match. When questions need tools, request all of "
+    "those tool calls together in a single turn rather than one question at a time."
+)
+
+
+async def run_agent_batched(client: "MultiServerMCPClient", prompts: list[str]):
+    """Answer all prompts in one agent run by sending them as a numbered list.
+
+    The model can then issue every prompt's tool calls in one turn (executed
+    concurrently by `agent_node`), so the prompts share LLM round trips instead
+    of paying them per prompt.
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    async with open_all_sessions(client) as all_tools:
+        agent = create_agent(all_tools)
+
+        numbered = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, start=1))
+        print(f"\n{'='*60}")
+        print(f"🧑 User:\n{numbered}")
+        print("-" * 40)
+
+        result = await agent.ainvoke({
+            "messages": [SystemMessage(content=BATCHED_SYSTEM_PROMPT), HumanMessage(content=numbered)]
+        })
+        print(f"🤖 Agent: {result['messages'][-1].content}")
+
+RUNNERS = {
+    # Explicit sessions for every server (most efficient)
+    "multi": run_agent_with_prompts_multi_server,
+    # Single server only
+    "session": run_agent_with_prompts_single_session,
+    # Less efficient: ~15 invocations
+    "no-session": run_agent_without_session,
+    # All prompts in one agent run
+    "batched": run_agent_batched,
+}
+
+
+async def main(mode: str = "multi"):
+    import httpx
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    from streamable_http_sigv4 import SharedAsyncTransport, shared_transport_client_factory
+
     # Using explicit session management - no need for session headers
     # This approach gives the best performance per session_behavior_analysis.md
+    # One keep-alive, HTTP/2 connection pool shared by every server's sessions;
+    # SigV4 signing stays per request via each connection's `auth`
+    shared_transport = SharedAsyncTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0),
+    )
+    http_client_factory = shared_transport_client_factory(shared_transport)
+
     client = MultiServerMCPClient({
         "agentcore1": {
             "transport": "streamable_http",
-            "url": AGENTCORE_MCP_URL,
+            "url": agentcore_mcp_url(),
             "auth": create_sigv4_auth(),
             "terminate_on_close": False,
+            "httpx_client_factory": http_client_factory,
             # Note: No Mcp-Session-Id header needed with explicit session management
         },
         # Add other MCP servers here:
@@ -195,13 +357,19 @@ async def main():
         "Say hello to Bob",
     ]
     
-    # Use multi-server with explicit session management (most efficient)
-    await run_agent_with_prompts_multi_server(client, prompts)
-    
-    # Alternative approaches for comparison:
-    # await run_agent_with_prompts_single_session(client, prompts)  # Single server only
-    # await run_agent_without_session(client, prompts)  # Less efficient: ~15 invocations
+    try:
+        await RUNNERS[mode](client, prompts)
+    finally:
+        await shared_transport.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run the LangGraph agent against the AgentCore MCP server")
+    parser.add_argument(
+        "--mode",
+        choices=sorted(RUNNERS),
+        default="multi",
+        help="Session strategy to run (default: multi)",
+    )
+    args = parser.parse_args()
+    run(main(mode=args.mode))
@@ -6,25 +6,39 @@ It exits with non-zero status if the invocation doesn't return a non-empty resul
 
 from __future__ import annotations
 
+import asyncio
 import json
 import sys
 
 import boto3
+import orjson
+from botocore.config import Config
 
 
 REGION = "us-west-2"
 QUALIFIER = "DEFAULT"
+PROMPTS = ["What is 15 + 27?"]
 AGENT_RUNTIME_ARN = (
     "arn:aws:bedrock-agentcore:us-west-2:482387069690:runtime/multiserver_mcp_agent-QlSXuKFOnc"
 )
 
+# Module-level client so repeated invoke() calls reuse pooled, kept-alive connections.
+_CLIENT = boto3.client(
+    "bedrock-agentcore",
+    region_name=REGION,
+    config=Config(
+        max_pool_connections=50,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        tcp_keepalive=True,
+    ),
+)
+
 
 def invoke(prompt: str) -> dict:
-    client = boto3.client("bedrock-agentcore", region_name=REGION)
-    resp = client.invoke_agent_runtime(
+    resp = _CLIENT.invoke_agent_runtime(
         agentRuntimeArn=AGENT_RUNTIME_ARN,
         qualifier=QUALIFIER,
-        payload=json.dumps({"prompt": prompt}),
+        payload=orjson.dumps({"prompt": prompt}),
     )
 
     stream = resp.get("response")
@@ -32,25 +46,45 @@ def invoke(prompt: str) -> dict:
         raise RuntimeError("No readable response body from AgentCore invoke")
 
     raw = stream.read()
-    text = raw.decode("utf-8", errors="replace") if isinstance(raw, (bytes, bytearray)) else str(raw)
-    return json.loads(text)
+    try:
+        # orjson parses bytes directly: no intermediate decoded str
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Malformed UTF-8 still parses leniently, as before
+        text = raw.decode("utf-8", errors="replace") if isinstance(raw, (bytes, bytearray)) else str(raw)
+        return json.loads(text)
 
 
-def main() -> int:
-    out = invoke("What is 15 + 27?")
+async def ainvoke(prompt: str) -> dict:
+    # The pooled boto3 client is thread-safe, so probes overlap on worker threads.
+    return await asyncio.to_thread(invoke, prompt)
+
+
+def _check_result(out: dict) -> str:
     if not isinstance(out, dict):
         raise RuntimeError(f"Unexpected response type: {type(out)}")
 
     result = out.get("result")
     if not isinstance(result, str) or not result.strip():
         raise RuntimeError(f"Missing/empty 'result' in response: {out}")
+    return result
+
+
+async def _main(prompts: list[str]) -> int:
+    outs = await asyncio.gather(*(ainvoke(prompt) for prompt in prompts))
+    results = [_check_result(out) for out in outs]
 
     print("OK")
     print("Runtime:", AGENT_RUNTIME_ARN)
-    print("Result:", result)
+    for result in results:
+        print("Result:", result)
     return 0
 
 
+def main() -> int:
+    return asyncio.run(_main(PROMPTS))
+
+
 if __name__ == "__main__":
     try:
         raise SystemExit(main())
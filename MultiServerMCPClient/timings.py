@@ -0,0 +1,38 @@
+"""Per-phase latency buckets aggregated through a ContextVar.
+
+Call `start_timings()` before opening the MCP transport so its background
+tasks inherit the same bucket dict; `timed(name)` is a no-op otherwise.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_buckets: ContextVar[dict[str, int] | None] = ContextVar("mcp_timings", default=None)
+
+
+def start_timings() -> dict[str, int]:
+    """Install a fresh bucket dict (name -> total nanoseconds) for this context."""
+    buckets: dict[str, int] = {}
+    _buckets.set(buckets)
+    return buckets
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the time spent in the block to bucket `name`, if timings are active."""
+    buckets = _buckets.get()
+    if buckets is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        buckets[name] = buckets.get(name, 0) + time.perf_counter_ns() - start
+
+
+def format_timings(buckets: dict[str, int]) -> str:
+    """Render the buckets as `name=12.3ms` pairs."""
+    return ", ".join(f"{name}={ns / 1e6:.1f}ms" for name, ns in buckets.items())
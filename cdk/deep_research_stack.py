@@ -36,7 +36,13 @@ class DeepResearchStack(Stack):
         #                                 )
 
         # Create AgentCore execution role
-        agent_role = AgentCoreRole(self, "AgentCoreRole")
+        agent_role = AgentCoreRole(
+            self, "AgentCoreRole",
+            enable_memory_access=True,
+            memory_arn="arn:aws:bedrock-agentcore:us-west-2:482387069690:memory/DeepResearchAgent-7gZmvrCKCl",
+            enable_ssm_access=True,
+            ssm_prefix="deep_research_scoping_agent"
+        )
 
         # Create AgentCore Runtime
         agent_runtime = bedrockagentcore.CfnRuntime(
@@ -1,118 +1,153 @@
 from aws_cdk import (
     aws_iam as iam,
-    Stack
+    Aws
 )
 from constructs import Construct
 
+# Region/account are CDK pseudo-parameter tokens, resolved at synth time, so the
+# policy document is a static literal built once per process.
+_REGION = Aws.REGION
+_ACCOUNT_ID = Aws.ACCOUNT_ID
+
+_POLICY_JSON = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Sid": "ECRImageAccess",
+            "Effect": "Allow",
+            "Action": [
+                "ecr:BatchGetImage",
+                "ecr:GetDownloadUrlForLayer",
+                "ecr:BatchCheckLayerAvailability"
+            ],
+            "Resource": [f"arn:aws:ecr:{_REGION}:{_ACCOUNT_ID}:repository/*"]
+        },
+        {
+            "Sid": "ECRTokenAccess",
+            "Effect": "Allow",
+            "Action": ["ecr:GetAuthorizationToken"],
+            "Resource": ["*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "logs:DescribeLogStreams",
+                "logs:CreateLogGroup"
+            ],
+            "Resource": [f"arn:aws:logs:{_REGION}:{_ACCOUNT_ID}:log-group:/aws/bedrock-agentcore/runtimes/*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": ["logs:DescribeLogGroups"],
+            "Resource": [f"arn:aws:logs:{_REGION}:{_ACCOUNT_ID}:log-group:*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "logs:CreateLogStream",
+                "logs:PutLogEvents"
+            ],
+            "Resource": [f"arn:aws:logs:{_REGION}:{_ACCOUNT_ID}:log-group:/aws/bedrock-agentcore/runtimes/*:log-stream:*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "xray:PutTraceSegments",
+                "xray:PutTelemetryRecords",
+                "xray:GetSamplingRules",
+                "xray:GetSamplingTargets"
+            ],
+            "Resource": ["*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": ["cloudwatch:PutMetricData"],
+            "Resource": ["*"],
+            "Condition": {
+                "StringEquals": {
+                    "cloudwatch:namespace": "bedrock-agentcore"
+                }
+            }
+        },
+        {
+            "Sid": "GetAgentAccessToken",
+            "Effect": "Allow",
+            "Action": [
+                "bedrock-agentcore:GetWorkloadAccessToken",
+                "bedrock-agentcore:GetWorkloadAccessTokenForJWT",
+                "bedrock-agentcore:GetWorkloadAccessTokenForUserId"
+            ],
+            "Resource": [
+                f"arn:aws:bedrock-agentcore:{_REGION}:{_ACCOUNT_ID}:workload-identity-directory/default",
+                f"arn:aws:bedrock-agentcore:{_REGION}:{_ACCOUNT_ID}:workload-identity-directory/default/workload-identity/*"
+            ]
+        },
+        {
+            "Sid": "BedrockModelInvocation",
+            "Effect": "Allow",
+            "Action": [
+                "bedrock:InvokeModel",
+                "bedrock:InvokeModelWithResponseStream"
+            ],
+            "Resource": [
+                "arn:aws:bedrock:*::foundation-model/*",
+                f"arn:aws:bedrock:{_REGION}:{_ACCOUNT_ID}:*"
+            ]
+        }
+    ]
+}
+
+
+def _memory_statement(memory_arn: str) -> dict:
+    return {
+        "Sid": "AgentCoreMemoryFullAccess",
+        "Effect": "Allow",
+        "Action": ["bedrock-agentcore:*"],
+        "Resource": [memory_arn]
+    }
+
+
+def _ssm_statement(ssm_prefix: str) -> dict:
+    return {
+        "Sid": "SSMParameterStoreRead",
+        "Effect": "Allow",
+        "Action": [
+            "ssm:GetParameter",
+            "ssm:GetParameters",
+            "ssm:GetParametersByPath"
+        ],
+        "Resource": [f"arn:aws:ssm:{_REGION}:{_ACCOUNT_ID}:parameter/{ssm_prefix.strip('/')}/*"]
+    }
+
+
 class AgentCoreRole(iam.Role):
-    def __init__(self, scope: Construct, construct_id: str, **kwargs):
-        region = Stack.of(scope).region
-        account_id = Stack.of(scope).account
-        
+    """AgentCore runtime execution role.
+
+    Memory and SSM read access are opt-in; without them the role only carries
+    the ECR, logging, tracing and model invocation statements.
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 enable_memory_access: bool = False,
+                 memory_arn: str | None = None,
+                 enable_ssm_access: bool = False,
+                 ssm_prefix: str | None = None,
+                 **kwargs):
+        statements = list(_POLICY_JSON["Statement"])
+        if enable_memory_access:
+            if not memory_arn:
+                raise ValueError("memory_arn is required when enable_memory_access is set")
+            statements.append(_memory_statement(memory_arn))
+        if enable_ssm_access:
+            if not ssm_prefix:
+                raise ValueError("ssm_prefix is required when enable_ssm_access is set")
+            statements.append(_ssm_statement(ssm_prefix))
+
         super().__init__(scope, construct_id,
             assumed_by=iam.ServicePrincipal("bedrock-agentcore.amazonaws.com"),
             inline_policies={
-                "AgentCorePolicy": iam.PolicyDocument(
-                    statements=[
-                        iam.PolicyStatement(
-                            sid="ECRImageAccess",
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "ecr:BatchGetImage",
-                                "ecr:GetDownloadUrlForLayer",
-                                "ecr:BatchCheckLayerAvailability"
-                            ],
-                            resources=[f"arn:aws:ecr:{region}:{account_id}:repository/*"]
-                        ),
-                        iam.PolicyStatement(
-                            sid="ECRTokenAccess", 
-                            effect=iam.Effect.ALLOW,
-                            actions=["ecr:GetAuthorizationToken"],
-                            resources=["*"]
-                        ),
-                        iam.PolicyStatement(
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "logs:DescribeLogStreams",
-                                "logs:CreateLogGroup"
-                            ],
-                            resources=[f"arn:aws:logs:{region}:{account_id}:log-group:/aws/bedrock-agentcore/runtimes/*"]
-                        ),
-                        iam.PolicyStatement(
-                            effect=iam.Effect.ALLOW,
-                            actions=["logs:DescribeLogGroups"],
-                            resources=[f"arn:aws:logs:{region}:{account_id}:log-group:*"]
-                        ),
-                        iam.PolicyStatement(
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "logs:CreateLogStream",
-                                "logs:PutLogEvents"
-                            ],
-                            resources=[f"arn:aws:logs:{region}:{account_id}:log-group:/aws/bedrock-agentcore/runtimes/*:log-stream:*"]
-                        ),
-                        iam.PolicyStatement(
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "xray:PutTraceSegments",
-                                "xray:PutTelemetryRecords", 
-                                "xray:GetSamplingRules",
-                                "xray:GetSamplingTargets"
-                            ],
-                            resources=["*"]
-                        ),
-                        iam.PolicyStatement(
-                            effect=iam.Effect.ALLOW,
-                            actions=["cloudwatch:PutMetricData"],
-                            resources=["*"],
-                            conditions={
-                                "StringEquals": {
-                                    "cloudwatch:namespace": "bedrock-agentcore"
-                                }
-                            }
-                        ),
-                        iam.PolicyStatement(
-                            sid="GetAgentAccessToken",
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "bedrock-agentcore:GetWorkloadAccessToken",
-                                "bedrock-agentcore:GetWorkloadAccessTokenForJWT", 
-                                "bedrock-agentcore:GetWorkloadAccessTokenForUserId"
-                            ],
-                            resources=[
-                                f"arn:aws:bedrock-agentcore:{region}:{account_id}:workload-identity-directory/default",
-                                f"arn:aws:bedrock-agentcore:{region}:{account_id}:workload-identity-directory/default/workload-identity/*"
-                            ]
-                        ),
-                        iam.PolicyStatement(
-                            sid="BedrockModelInvocation",
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "bedrock:InvokeModel",
-                                "bedrock:InvokeModelWithResponseStream"
-                            ],
-                            resources=[
-                                "arn:aws:bedrock:*::foundation-model/*",
-                                f"arn:aws:bedrock:{region}:{account_id}:*"
-                            ]
-                        ),
-                        iam.PolicyStatement(
-                            sid="AgentCoreMemoryFullAccess",
-                            effect=iam.Effect.ALLOW,
-                            actions=["bedrock-agentcore:*"],
-                            resources=["arn:aws:bedrock-agentcore:us-west-2:482387069690:memory/DeepResearchAgent-7gZmvrCKCl"]
-                        ),
-                        iam.PolicyStatement(
-                            sid="SSMParameterStoreRead",
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "ssm:GetParameter",
-                                "ssm:GetParameters",
-                                "ssm:GetParametersByPath"
-                            ],
-                            resources=[f"arn:aws:ssm:{region}:{account_id}:parameter/deep_research_scoping_agent/*"]
-                        )
-                    ]
+                "AgentCorePolicy": iam.PolicyDocument.from_json(
+                    {**_POLICY_JSON, "Statement": statements}
                 )
             },
             **kwargs
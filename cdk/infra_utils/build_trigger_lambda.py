@@ -1,8 +1,29 @@
 import boto3
 import json
 import logging
-import time
+import threading
 import urllib3
+from functools import lru_cache
+from urllib.parse import urlparse
+from botocore.config import Config
+from botocore.exceptions import WaiterError
+from botocore.waiter import WaiterModel, create_waiter_with_client
+
+# Module-level clients are reused by warm invocations, keeping their pooled
+# TLS connections to CodeBuild and the CloudFormation response URL. Adaptive
+# retries rate-limit client-side when parallel stacks get throttled.
+_http = urllib3.PoolManager(maxsize=4, retries=urllib3.Retry(total=3, backoff_factor=0.5))
+_CODEBUILD_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=5,
+    read_timeout=15,
+)
+
+@lru_cache(maxsize=1)
+def _codebuild():
+    # Built on first use so Delete requests never pay for client creation.
+    return boto3.client('codebuild', config=_CODEBUILD_CONFIG)
 
 # Note: cfnresponse is only available for inline Lambda code in CloudFormation.
 # When using CDK with Code.from_asset(), we need to include our own copy.
@@ -28,18 +49,18 @@ class cfnresponse:
             'Data': responseData
         }
 
-        json_responseBody = json.dumps(responseBody)
-        print("Response body:")
-        print(json_responseBody)
+        # Content-Length must count encoded bytes, not characters, for non-ASCII reasons.
+        body = json.dumps(responseBody, separators=(',', ':')).encode('utf-8')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", body)
 
         headers = {
             'content-type': '',
-            'content-length': str(len(json_responseBody))
+            'content-length': str(len(body))
         }
 
         try:
-            http = urllib3.PoolManager()
-            response = http.request('PUT', responseUrl, headers=headers, body=json_responseBody)
+            response = _http.request('PUT', responseUrl, headers=headers, body=body)
             print("Status code:", response.status)
         except Exception as e:
             print("send(..) failed executing http.request(..):", e)
@@ -47,9 +68,43 @@ class cfnresponse:
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# botocore ships no CodeBuild waiters, so define a BuildComplete waiter over
+# batch_get_builds; it owns the delay and terminal-state detection.
+BUILD_POLL_DELAY = 10
+BUILD_FAILED_STATUSES = ['FAILED', 'FAULT', 'STOPPED', 'TIMED_OUT']
+_BUILD_WAITER_MODEL = WaiterModel({
+    'version': 2,
+    'waiters': {
+        'BuildComplete': {
+            'operation': 'BatchGetBuilds',
+            'delay': BUILD_POLL_DELAY,
+            'maxAttempts': 90,
+            'acceptors': [
+                {'state': 'success', 'matcher': 'path', 'argument': 'builds[0].buildStatus', 'expected': 'SUCCEEDED'},
+                *(
+                    {'state': 'failure', 'matcher': 'path', 'argument': 'builds[0].buildStatus', 'expected': status}
+                    for status in BUILD_FAILED_STATUSES
+                ),
+            ],
+        }
+    },
+})
+
+def _warm_response_connection(response_url):
+    """Open a pooled connection to the ResponseURL host so the final PUT skips the TLS handshake."""
+    parsed = urlparse(response_url)
+    try:
+        _http.request('HEAD', f"{parsed.scheme}://{parsed.netloc}/", retries=False, timeout=5.0)
+    except Exception as e:
+        logger.info('Response URL warm-up failed: %s', e)
+
 def handler(event, context):
     logger.info('Received event: %s', json.dumps(event))
     
+    if event['RequestType'] != 'Delete':
+        # The PUT only happens after the build, so warm the connection meanwhile.
+        threading.Thread(target=_warm_response_connection, args=(event['ResponseURL'],), daemon=True).start()
+    
     try:
         if event['RequestType'] == 'Delete':
             cfnresponse.send(event, context, cfnresponse.SUCCESS, {})
@@ -57,37 +112,32 @@ def handler(event, context):
             
         project_name = event['ResourceProperties']['ProjectName']
         
-        codebuild = boto3.client('codebuild')
-        
         # Start build
-        response = codebuild.start_build(projectName=project_name)
+        response = _codebuild().start_build(projectName=project_name)
         build_id = response['build']['id']
         logger.info(f"Started build: {build_id}")
         
         # Wait for completion
         max_wait_time = context.get_remaining_time_in_millis() / 1000 - 30
-        start_time = time.time()
+        max_attempts = max(int(max_wait_time / BUILD_POLL_DELAY), 1)
+        waiter = create_waiter_with_client('BuildComplete', _BUILD_WAITER_MODEL, _codebuild())
         
-        while True:
-            if time.time() - start_time > max_wait_time:
-                cfnresponse.send(event, context, cfnresponse.FAILED, {'Error': 'Build timeout'})
-                return
-                
-            build_response = codebuild.batch_get_builds(ids=[build_id])
-            build_status = build_response['builds'][0]['buildStatus']
-            
-            if build_status == 'SUCCEEDED':
-                logger.info(f"Build {build_id} succeeded")
-                cfnresponse.send(event, context, cfnresponse.SUCCESS, {'BuildId': build_id})
-                return
-            elif build_status in ['FAILED', 'FAULT', 'STOPPED', 'TIMED_OUT']:
+        try:
+            waiter.wait(ids=[build_id], WaiterConfig={'Delay': BUILD_POLL_DELAY, 'MaxAttempts': max_attempts})
+        except WaiterError as e:
+            builds = (e.last_response or {}).get('builds') or [{}]
+            build_status = builds[0].get('buildStatus')
+            if build_status in BUILD_FAILED_STATUSES:
                 logger.error(f"Build {build_id} failed with status: {build_status}")
                 cfnresponse.send(event, context, cfnresponse.FAILED, {'Error': f'Build failed: {build_status}'})
-                return
-                
-            logger.info(f"Build {build_id} status: {build_status}")
-            time.sleep(30)
+            else:
+                logger.error(f"Build {build_id} did not finish: {e}")
+                cfnresponse.send(event, context, cfnresponse.FAILED, {'Error': 'Build timeout'})
+            return
             
+        logger.info(f"Build {build_id} succeeded")
+        cfnresponse.send(event, context, cfnresponse.SUCCESS, {'BuildId': build_id})
+        
     except Exception as e:
         logger.error('Error: %s', str(e))
         cfnresponse.send(event, context, cfnresponse.FAILED, {'Error': str(e)})
@@ -3,6 +3,10 @@
 Implements streaming via an async generator:
 - Each `yield` is turned into a Server-Sent Events (SSE) `data:` chunk by AgentCore.
 - The yielded object should be JSON-serializable.
+- With `"stream_mode": "values"`, `"values_delta": true` streams only the
+  state that changed per step instead of the full state.
+- With `"stream_mode": "messages"`, model text is streamed token by token as
+  `{"node": ..., "token": ...}` events.
 
 Local run:
   /workspaces/agent_core_deep_research/.venv/bin/python -m langgraph_streaming.agentcore_langgraph_math_streaming
@@ -15,9 +19,11 @@ Local invoke (streams SSE):
 
 from __future__ import annotations
 
+import asyncio
 import sys
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Iterator
 
 from bedrock_agentcore import BedrockAgentCoreApp
 
@@ -30,21 +36,98 @@ if str(_repo_root) not in sys.path:
 
 # Import the graph streaming helper (server-side adaptor)
 from langgraph_streaming.worker_evaluator_math_agent import (
-  answer_math_question,
+  answer_math_question_async,
   answer_math_question_streaming,
 )
 
 app = BedrockAgentCoreApp()
 
+STREAM_QUEUE_SIZE = 32
+_DONE = object()
+
+
+async def _iterate_in_thread(make_events: Callable[[], Iterator[Any]]) -> AsyncIterator[Any]:
+  """Run a blocking generator in a producer thread and yield its items here.
+
+  Items are bridged through a bounded asyncio.Queue, so a slow SSE consumer
+  applies back-pressure instead of buffering without limit. Errors are
+  re-raised in the consumer.
+  """
+  loop = asyncio.get_running_loop()
+  queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+  stop = threading.Event()
+
+  def put(item: Any) -> None:
+    asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+  def produce() -> None:
+    try:
+      for item in make_events():
+        put(item)
+        if stop.is_set():
+          return
+    except BaseException as e:
+      put(e)
+    finally:
+      if not stop.is_set():
+        put(_DONE)
+
+  threading.Thread(target=produce, daemon=True).start()
+  try:
+    while (item := await queue.get()) is not _DONE:
+      if isinstance(item, BaseException):
+        raise item
+      yield item
+  finally:
+    # On early exit (e.g. client disconnect) stop the producer and unblock a
+    # pending put so the thread can finish.
+    stop.set()
+    while not queue.empty():
+      queue.get_nowait()
+
+
+def _values_deltas(events: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+  """Reduce full-state `values` events to the fields that changed.
+
+  `messages` is append-only, so only the new messages are sent. Each event
+  is marked with `"delta": true`; the client reassembles state by applying
+  them in order.
+  """
+  last: dict[str, Any] = {}
+  for event in events:
+    values = event.get("values")
+    if not isinstance(values, dict):
+      yield event
+      continue
+
+    delta: dict[str, Any] = {}
+    for key, value in values.items():
+      if key == "messages" and isinstance(value, list):
+        new_messages = value[len(last.get(key) or ()):]
+        if new_messages:
+          delta[key] = new_messages
+      elif last.get(key) != value:
+        delta[key] = value
+    last = values
+    yield {**event, "values": delta, "delta": True}
+
 
 async def _invoke_stream(payload: dict[str, Any]):
   """Stream LangGraph step events as SSE chunks."""
 
   user_input = payload.get("prompt", "")
-  stream_mode = payload.get("stream_mode", "updates")  # "updates" | "values"
+  stream_mode = payload.get("stream_mode", "updates")  # "updates" | "values" | "messages"
+  # Opt-in: send only changed state in "values" mode instead of the full state.
+  values_delta = stream_mode == "values" and bool(payload.get("values_delta"))
+
+  def make_events() -> Iterator[dict[str, Any]]:
+    events = answer_math_question_streaming(user_input, stream_mode=stream_mode)
+    return _values_deltas(events) if values_delta else events
 
+  # The LangGraph generator blocks on model calls; run it in a producer thread
+  # so the event loop stays free for SSE flushes and other invocations.
   try:
-    for event in answer_math_question_streaming(user_input, stream_mode=stream_mode):
+    async for event in _iterate_in_thread(make_events):
       yield event
   except Exception as e:
     yield {"type": "stream_error", "error": str(e)}
@@ -65,7 +148,7 @@ async def invoke(payload: dict[str, Any]):
 
   user_input = payload.get("prompt", "")
   try:
-    result = answer_math_question(user_input)
+    result = await answer_math_question_async(user_input)
     final_answer = result.get("final_answer") or result.get("worker_output") or ""
     return {
       "result": final_answer,
@@ -0,0 +1,231 @@
+"""Answer many math questions offline through Bedrock Batch Inference.
+
+Batch jobs are cheaper than on-demand calls for non-interactive runs such as
+nightly evaluations. The worker and evaluator prompts are the ones the
+LangGraph agent uses (`_worker_messages` / `_evaluation_messages`), but a batch
+job cannot execute tool calls, so the worker answers in a single turn.
+
+Notes:
+- Bedrock enforces a minimum number of records per batch job (100 for most
+  models); pad small runs or use `answer_math_question` instead.
+- The IAM role passed as `role_arn` must be assumable by bedrock.amazonaws.com
+  and have read/write access to the S3 prefix.
+
+Usage:
+  python -m langgraph_streaming.batch_runner \
+    --questions questions.txt \
+    --bucket my-batch-bucket \
+    --role-arn arn:aws:iam::123456789012:role/BedrockBatchRole
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any
+
+import boto3
+from botocore.config import Config
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from langgraph_streaming.worker_evaluator_math_agent import (
+    _evaluation_messages,
+    _worker_messages,
+)
+
+DEFAULT_MODEL_ID = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+MAX_TOKENS = 1024
+
+JOB_POLL_INITIAL_DELAY = 30.0
+JOB_POLL_MAX_DELAY = 300.0
+JOB_POLL_BACKOFF = 1.5
+JOB_END_STATUSES = {"Completed", "PartiallyCompleted", "Failed", "Stopped", "Expired"}
+
+_CLIENT_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 5}, tcp_keepalive=True)
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    # Structured content blocks: keep the text parts.
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+    )
+
+
+def _to_model_input(messages: list[BaseMessage]) -> dict[str, Any]:
+    """Convert LangChain messages to an Anthropic Messages API request body."""
+    system = "\n\n".join(_text(m.content) for m in messages if isinstance(m, SystemMessage))
+    turns = [
+        {
+            "role": "user" if isinstance(m, HumanMessage) else "assistant",
+            "content": [{"type": "text", "text": _text(m.content)}],
+        }
+        for m in messages
+        if not isinstance(m, SystemMessage)
+    ]
+    body: dict[str, Any] = {
+        "anthropic_version": ANTHROPIC_VERSION,
+        "max_tokens": MAX_TOKENS,
+        "messages": turns,
+    }
+    if system:
+        body["system"] = system
+    return body
+
+
+def _record_id(index: int) -> str:
+    # Batch record ids are fixed-width so output order can be restored.
+    return f"REC{index:08d}"
+
+
+def run_batch_job(
+    model_inputs: list[dict[str, Any]],
+    *,
+    bucket: str,
+    role_arn: str,
+    prefix: str = "math-batch",
+    model_id: str = DEFAULT_MODEL_ID,
+    region_name: str | None = None,
+) -> list[str]:
+    """Run one batch inference job and return the response text per input, in order.
+
+    Records that failed in the job come back as empty strings.
+    """
+    session = boto3.Session(region_name=region_name)
+    s3 = session.client("s3", config=_CLIENT_CONFIG)
+    bedrock = session.client("bedrock", config=_CLIENT_CONFIG)
+
+    run_id = uuid.uuid4().hex[:12]
+    input_key = f"{prefix}/{run_id}/input/records.jsonl"
+    output_prefix = f"{prefix}/{run_id}/output/"
+
+    body = "\n".join(
+        json.dumps({"recordId": _record_id(i), "modelInput": model_input})
+        for i, model_input in enumerate(model_inputs)
+    )
+    s3.put_object(Bucket=bucket, Key=input_key, Body=body.encode("utf-8"))
+
+    job_arn = bedrock.create_model_invocation_job(
+        jobName=f"math-batch-{run_id}",
+        roleArn=role_arn,
+        modelId=model_id,
+        inputDataConfig={"s3InputDataConfig": {"s3Uri": f"s3://{bucket}/{input_key}"}},
+        outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{bucket}/{output_prefix}"}},
+    )["jobArn"]
+    print(f"Submitted batch job {job_arn} ({len(model_inputs)} records)")
+
+    # Jobs take minutes to hours; poll with jittered backoff.
+    delay = JOB_POLL_INITIAL_DELAY
+    while True:
+        job = bedrock.get_model_invocation_job(jobIdentifier=job_arn)
+        status = job["status"]
+        print(f"Batch job status: {status}")
+        if status in JOB_END_STATUSES:
+            break
+        time.sleep(delay * random.uniform(0.9, 1.1))
+        delay = min(delay * JOB_POLL_BACKOFF, JOB_POLL_MAX_DELAY)
+
+    if status not in {"Completed", "PartiallyCompleted"}:
+        raise RuntimeError(f"Batch job {job_arn} ended with status {status}: {job.get('message', '')}")
+
+    # Output lands under <output_prefix>/<job id>/<input file name>.out
+    job_id = job_arn.rsplit("/", 1)[-1]
+    output_key = f"{output_prefix}{job_id}/{os.path.basename(input_key)}.out"
+    raw = s3.get_object(Bucket=bucket, Key=output_key)["Body"].read()
+
+    texts: dict[str, str] = {}
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        output = record.get("modelOutput") or {}
+        texts[record["recordId"]] = _text(output.get("content", []))
+    return [texts.get(_record_id(i), "") for i in range(len(model_inputs))]
+
+
+def answer_math_questions_batch(
+    questions: list[str],
+    *,
+    bucket: str,
+    role_arn: str,
+    evaluate: bool = True,
+    **job_kwargs: Any,
+) -> list[dict[str, Any]]:
+    """Answer `questions` with one worker batch job and, optionally, one evaluator job.
+
+    Returns one dict per question with the same answer fields as
+    `answer_math_question` (without the message history).
+    """
+    states = [
+        {"messages": [HumanMessage(content=q)], "worker_output": "", "evaluation_result": ""}
+        for q in questions
+    ]
+    worker_outputs = run_batch_job(
+        [_to_model_input(_worker_messages(state)) for state in states],
+        bucket=bucket,
+        role_arn=role_arn,
+        **job_kwargs,
+    )
+
+    evaluations = [""] * len(questions)
+    if evaluate:
+        for state, output in zip(states, worker_outputs):
+            state["worker_output"] = output
+        evaluations = run_batch_job(
+            [_to_model_input(_evaluation_messages(state)) for state in states],
+            bucket=bucket,
+            role_arn=role_arn,
+            **job_kwargs,
+        )
+
+    return [
+        {
+            "question": question,
+            "worker_output": output,
+            "evaluation_result": evaluation,
+            "final_answer": output,
+        }
+        for question, output, evaluation in zip(questions, worker_outputs, evaluations)
+    ]
+
+
+def main() -> int:
+    """Submit the questions as a Bedrock batch job and print the graded results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", required=True, help="Text file with one question per line")
+    parser.add_argument("--bucket", required=True, help="S3 bucket for batch input/output")
+    parser.add_argument("--role-arn", required=True, help="IAM role Bedrock assumes for the job")
+    parser.add_argument("--prefix", default="math-batch", help="S3 key prefix")
+    parser.add_argument("--model-id", default=DEFAULT_MODEL_ID)
+    parser.add_argument(
+        "--region",
+        default=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-west-2",
+    )
+    parser.add_argument("--no-evaluate", dest="evaluate", action="store_false")
+    args = parser.parse_args()
+
+    with open(args.questions, encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip()]
+
+    results = answer_math_questions_batch(
+        questions,
+        bucket=args.bucket,
+        role_arn=args.role_arn,
+        evaluate=args.evaluate,
+        prefix=args.prefix,
+        model_id=args.model_id,
+        region_name=args.region,
+    )
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
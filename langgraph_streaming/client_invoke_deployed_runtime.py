@@ -16,77 +16,152 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sys
+from collections.abc import Iterator
+from functools import lru_cache
 from typing import Any, Optional
 
 import boto3
+from botocore.config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+else:
+    _loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=2,
+            sort_keys=True,
+        )
 
 
-def _json_dumps(obj: Any) -> str:
-    return json.dumps(
-        obj,
-        ensure_ascii=False,
-        indent=2,
-        sort_keys=True,
-    )
-
-
-def _try_json_loads(text: str) -> Any:
+def _try_json_loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str; non-JSON input is returned as text."""
     try:
-        return json.loads(text)
-    except Exception:
-        return text
+        return _loads(data)
+    except ValueError:
+        if isinstance(data, (bytes, bytearray)):
+            return data.decode("utf-8", errors="replace")
+        return data
+
+
+@lru_cache(maxsize=4)
+def _client(region: str) -> Any:
+    """Return a bedrock-agentcore client for `region`, shared across calls in this process."""
+    return boto3.client(
+        "bedrock-agentcore",
+        region_name=region,
+        config=Config(
+            tcp_keepalive=True,
+            max_pool_connections=16,
+            retries={"mode": "adaptive", "max_attempts": 5},
+        ),
+    )
 
 
-def _handle_sse_lines(stream: Any) -> None:
+SSE_CHUNK_SIZE = 4096
+_DATA = b"data:"
+_DATA_LEN = len(_DATA)
+_JSON_START = frozenset((b"{", b"[", b'"'))
+
+
+def _print_sse_line(line: bytes, compact: bool = False) -> None:
+    """Print the payload of one raw SSE `data:` line; other lines are ignored.
+
+    In compact mode the payload is written verbatim, skipping the
+    parse/pretty-print round trip.
+    """
+    # Lines arrive already split on "\n"; per the SSE spec only a trailing "\r"
+    # and the single space after the colon need trimming.
+    if not line.startswith(_DATA):
+        return
+
+    data = line[_DATA_LEN:]
+    if data[:1] == b" ":
+        data = data[1:]
+    if data.endswith(b"\r"):
+        data = data[:-1]
+    if not data:
+        return
+
+    if compact:
+        out = sys.stdout.buffer
+        out.write(data + b"\n")
+        out.flush()
+        return
+
+    # Plain-text payloads (e.g. streamed tokens) skip the JSON decode attempt.
+    if data[:1] in _JSON_START:
+        parsed = _try_json_loads(data)
+    else:
+        parsed = data.decode("utf-8", errors="replace")
+    if isinstance(parsed, dict):
+        print(_json_dumps(parsed))
+    else:
+        print(_json_dumps({"type": "data", "data": parsed}))
+
+
+def _iter_sse_chunks(stream: Any) -> Iterator[bytes]:
+    """Yield body bytes from a StreamingBody as soon as they arrive."""
+    # StreamingBody.read(n) blocks until n bytes arrive, which would hold small
+    # SSE events back; urllib3's stream() yields each chunk as it is received.
+    raw = getattr(stream, "_raw_stream", None)
+    if raw is not None and hasattr(raw, "stream"):
+        yield from raw.stream(SSE_CHUNK_SIZE)
+        return
+    # Fall back to per-byte reads, which never wait for a full buffer.
+    for line in stream.iter_lines(chunk_size=1):
+        yield line + b"\n"
+
+
+def _handle_sse_lines(stream: Any, compact: bool = False) -> None:
     """Read SSE lines from a StreamingBody-like object and print parsed data events."""
-
-    # Botocore StreamingBody implements iter_lines().
-    for raw_line in stream.iter_lines(chunk_size=1):
-        if not raw_line:
-            continue
-
-        line = raw_line.decode("utf-8") if isinstance(raw_line, (bytes, bytearray)) else str(raw_line)
-        line = line.strip()
-        if not line:
-            continue
-
-        if not line.startswith("data:"):
-            continue
-
-        payload = line[len("data:") :].strip()
-        if not payload:
-            continue
-
-        parsed = _try_json_loads(payload)
-        if isinstance(parsed, dict):
-            print(_json_dumps(parsed))
-        else:
-            print(_json_dumps({"type": "data", "data": parsed}))
-
-
-def _extract_bytes_from_event(event: Any) -> Optional[bytes]:
+    # Frame lines locally on bytes; each completed line is printed immediately.
+    buf = bytearray()
+    for chunk in _iter_sse_chunks(stream):
+        buf.extend(chunk)
+        while (nl := buf.find(b"\n")) != -1:
+            line = bytes(buf[:nl])
+            del buf[: nl + 1]
+            _print_sse_line(line, compact)
+    if buf:
+        _print_sse_line(bytes(buf), compact)
+
+
+def _extract_bytes_from_event(event: Any) -> Optional[bytes | bytearray]:
     """Best-effort extraction of bytes from various streamed event shapes."""
 
-    if isinstance(event, (bytes, bytearray)):
-        return bytes(event)
+    if type(event) is bytes or type(event) is bytearray:
+        return event
 
-    if isinstance(event, dict):
-        # Common botocore EventStream shapes:
-        #  - {"chunk": {"bytes": b"..."}}
-        #  - {"bytes": b"..."}
-        chunk = event.get("chunk")
-        if isinstance(chunk, dict) and isinstance(chunk.get("bytes"), (bytes, bytearray)):
-            return bytes(chunk["bytes"])
-        if isinstance(event.get("bytes"), (bytes, bytearray)):
-            return bytes(event["bytes"])
-
-    return None
+    # Common botocore EventStream shapes:
+    #  - {"chunk": {"bytes": b"..."}}
+    #  - {"bytes": b"..."}
+    try:
+        data = event["chunk"]["bytes"]
+    except (KeyError, TypeError, IndexError):
+        try:
+            data = event["bytes"]
+        except (KeyError, TypeError, IndexError):
+            return None
+    return data if isinstance(data, (bytes, bytearray)) else None
 
 
-def _handle_eventstream(stream: Any) -> None:
+def _handle_eventstream(stream: Any, compact: bool = False) -> None:
     """Handle botocore EventStream-like iterables by printing chunked data."""
 
-    buffer = b""
+    buffer = bytearray()
     for event in stream:
         payload_bytes = _extract_bytes_from_event(event)
         if payload_bytes is None:
@@ -97,24 +172,14 @@ def _handle_eventstream(stream: Any) -> None:
                 print(_json_dumps({"type": "event", "event": str(event)}))
             continue
 
-        buffer += payload_bytes
+        buffer.extend(payload_bytes)
 
         # SSE frames are line-oriented; flush complete lines as they arrive.
-        while b"\n" in buffer:
-            line_bytes, buffer = buffer.split(b"\n", 1)
-            line = line_bytes.decode("utf-8", errors="replace").strip()
-            if not line:
-                continue
-            if not line.startswith("data:"):
-                continue
-            data = line[len("data:") :].strip()
-            if not data:
-                continue
-            parsed = _try_json_loads(data)
-            if isinstance(parsed, dict):
-                print(_json_dumps(parsed))
-            else:
-                print(_json_dumps({"type": "data", "data": parsed}))
+        # orjson/json accept the raw bytes, so lines are never decoded here.
+        while (nl := buffer.find(b"\n")) != -1:
+            line = bytes(buffer[:nl])
+            del buffer[: nl + 1]
+            _print_sse_line(line, compact)
 
 
 def main() -> int:
@@ -151,10 +216,25 @@ def main() -> int:
     parser.add_argument(
         "--stream-mode",
         default="updates",
-        choices=["updates", "values"],
+        choices=["updates", "values", "messages"],
         help="Streaming mode",
     )
+    parser.add_argument(
+        "--values-delta",
+        action="store_true",
+        help="With --stream-mode values, receive only the changed state per step",
+    )
+    parser.add_argument(
+        "--compact",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Write each streamed `data:` payload (or a non-streaming body) verbatim instead "
+            "of pretty-printing it. Defaults to on when stdout is not a terminal."
+        ),
+    )
     args = parser.parse_args()
+    compact = args.compact if args.compact is not None else not sys.stdout.isatty()
 
     if not args.arn:
         print(
@@ -167,13 +247,15 @@ def main() -> int:
         )
         return 2
 
-    client = boto3.client("bedrock-agentcore", region_name=args.region)
+    client = _client(args.region)
 
     payload_obj: dict[str, Any] = {
         "prompt": args.prompt,
         "stream": True,
         "stream_mode": args.stream_mode,
     }
+    if args.values_delta:
+        payload_obj["values_delta"] = True
 
     resp = client.invoke_agent_runtime(
         agentRuntimeArn=args.arn,
@@ -200,12 +282,18 @@ def main() -> int:
 
     # Streaming case: StreamingBody with SSE
     if "text/event-stream" in content_type and hasattr(stream, "iter_lines"):
-        _handle_sse_lines(stream)
+        _handle_sse_lines(stream, compact)
         return 0
 
     # Non-streaming case: StreamingBody with JSON/text
     if hasattr(stream, "read"):
         raw = stream.read()
+        if compact:
+            # Piped output (e.g. into jq): forward the body as-is.
+            out = sys.stdout.buffer
+            out.write(raw if isinstance(raw, (bytes, bytearray)) else str(raw).encode("utf-8"))
+            out.write(b"\n")
+            return 0
         text = raw.decode("utf-8", errors="replace") if isinstance(raw, (bytes, bytearray)) else str(raw)
         parsed = _try_json_loads(text)
         if isinstance(parsed, dict):
@@ -217,7 +305,7 @@ def main() -> int:
 
     # Some SDKs return botocore.eventstream.EventStream (iterable of events)
     if hasattr(stream, "__iter__"):
-        _handle_eventstream(stream)
+        _handle_eventstream(stream, compact)
         return 0
 
     print(_json_dumps({"type": "unknown_stream", "contentType": content_type, "stream": str(stream)}))
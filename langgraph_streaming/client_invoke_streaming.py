@@ -11,49 +11,146 @@ Normal (default):
         langgraph_streaming/client_invoke_streaming.py \
         --prompt "What is (10 + 5) * 3?"
 
+Many concurrent streams on one event loop (stress test):
+    python langgraph_streaming/client_invoke_streaming.py \
+        --stream --async --concurrency 50
+
 Notes:
 - Default behavior is a normal JSON response.
 - With `--stream`, AgentCore streams Server-Sent Events (SSE).
 - Each server `yield` becomes an SSE `data:` line.
-- Streaming mode reads lines, extracts `data: ...`, and JSON-decodes when possible.
+- Streaming mode splits the raw byte stream into lines, extracts `data: ...`,
+  and JSON-decodes when possible.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import importlib.util
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 import requests
-
-
-def _parse_sse_data_line(line: str) -> Optional[Dict[str, Any]]:
-    """Parse one SSE line (already decoded) into a JSON object when possible."""
-
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+STREAM_CHUNK_SIZE = 8192
+_DATA = b"data:"
+_DATA_LEN = len(_DATA)
+_JSON_START = frozenset((b"{", b"[", b'"'))
+
+# One keep-alive session per process so repeated invocations reuse the
+# TCP/TLS connection to the runtime endpoint.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+
+def _parse_sse_data_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one raw SSE line into a JSON object when possible."""
     # Typical SSE framing from AgentCore:
     #   data: {"type":"...", ...}
     # Plus possible blank lines and other fields.
-    if not line.startswith("data:"):
+    # Lines arrive already split on "\n"; per the SSE spec only a trailing "\r"
+    # and the single space after the colon need trimming.
+    if not line.startswith(_DATA):
         return None
 
-    raw = line[len("data:") :].strip()
+    raw = line[_DATA_LEN:]
+    if raw[:1] == b" ":
+        raw = raw[1:]
+    if raw.endswith(b"\r"):
+        raw = raw[:-1]
     if not raw:
         return None
 
     # Common cases:
     # - Raw is JSON object/array
     # - Raw is a JSON string (quoted)
-    # - Raw is plain text
+    # - Raw is plain text (e.g. streamed tokens): skip the decode attempt
+    if raw[:1] not in _JSON_START:
+        return {"type": "data", "data": raw.decode("utf-8", errors="replace")}
     try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
-        return {"type": "data", "data": raw}
+        parsed = _loads(raw)
+    except ValueError:
+        return {"type": "data", "data": raw.decode("utf-8", errors="replace")}
 
     if isinstance(parsed, dict):
         return parsed
     return {"type": "data", "data": parsed}
 
 
+def _iter_sse_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split a byte stream into lines, yielding each as soon as it is complete."""
+    buf = bytearray()
+    for chunk in chunks:
+        buf.extend(chunk)
+        while (nl := buf.find(b"\n")) != -1:
+            line = bytes(buf[:nl])
+            del buf[: nl + 1]
+            yield line
+    if buf:
+        yield bytes(buf)
+
+
+async def _stream_async(
+    client: Any, url: str, payload: Dict[str, Any], index: Optional[int]
+) -> None:
+    """Stream one SSE response with httpx, printing events as they arrive."""
+    async with client.stream(
+        "POST", url, json=payload, headers={"Accept": "text/event-stream"}
+    ) as resp:
+        resp.raise_for_status()
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes():
+            buf.extend(chunk)
+            while (nl := buf.find(b"\n")) != -1:
+                event = _parse_sse_data_line(bytes(buf[:nl]))
+                del buf[: nl + 1]
+                if event is not None:
+                    print(_dumps(event if index is None else {"stream": index, "event": event}))
+        if buf and (event := _parse_sse_data_line(bytes(buf))) is not None:
+            print(_dumps(event if index is None else {"stream": index, "event": event}))
+
+
+async def _run_async(url: str, payload: Dict[str, Any], concurrency: int, timeout: float) -> None:
+    """Multiplex `concurrency` SSE streams of the same payload on one event loop."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    # HTTP/2 lets the streams share one TLS connection when h2 is installed.
+    http2 = importlib.util.find_spec("h2") is not None
+    async with httpx.AsyncClient(http2=http2, timeout=timeout, limits=limits) as client:
+        await asyncio.gather(
+            *(
+                _stream_async(client, url, payload, None if concurrency == 1 else i)
+                for i in range(concurrency)
+            )
+        )
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--url", default="http://localhost:8080/invocations")
@@ -70,29 +167,52 @@ def main() -> int:
     parser.add_argument(
         "--stream-mode",
         default="updates",
-        choices=["updates", "values"],
+        choices=["updates", "values", "messages"],
         help="Streaming mode (only used with --stream)",
     )
+    parser.add_argument(
+        "--values-delta",
+        action="store_true",
+        help="With --stream-mode values, receive only the changed state per step",
+    )
     parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--async",
+        dest="async_mode",
+        action="store_true",
+        help="Stream with httpx on an asyncio event loop (only used with --stream)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of concurrent streams in --async mode; events are tagged by stream index",
+    )
     args = parser.parse_args()
 
     payload: Dict[str, Any] = {"prompt": args.prompt}
 
     if not args.stream:
-        resp = requests.post(args.url, json=payload, timeout=args.timeout)
+        resp = _session.post(args.url, json=payload, timeout=args.timeout)
         resp.raise_for_status()
         # Server returns JSON; fall back to raw text if not JSON.
         try:
             data = resp.json()
         except ValueError:
             data = {"type": "data", "data": resp.text}
-        print(json.dumps(data, ensure_ascii=False))
+        print(_dumps(data))
         return 0
 
     payload["stream"] = True
     payload["stream_mode"] = args.stream_mode
+    if args.values_delta:
+        payload["values_delta"] = True
 
-    with requests.post(
+    if args.async_mode:
+        asyncio.run(_run_async(args.url, payload, max(args.concurrency, 1), args.timeout))
+        return 0
+
+    with _session.post(
         args.url,
         json=payload,
         stream=True,
@@ -101,18 +221,14 @@ def main() -> int:
     ) as resp:
         resp.raise_for_status()
 
-        for raw_line in resp.iter_lines(decode_unicode=True):
-            if raw_line is None:
-                continue
-            line = raw_line.strip()
-            if not line:
-                continue
-
+        # Read the underlying urllib3 response directly and frame lines on bytes;
+        # iter_lines(decode_unicode=True) decodes and re-splits every chunk.
+        for line in _iter_sse_lines(resp.raw.stream(STREAM_CHUNK_SIZE, decode_content=True)):
             event = _parse_sse_data_line(line)
             if event is None:
                 continue
 
-            print(json.dumps(event, ensure_ascii=False))
+            print(_dumps(event))
 
     return 0
 
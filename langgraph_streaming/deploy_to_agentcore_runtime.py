@@ -18,10 +18,19 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
+import random
 import time
 
 from bedrock_agentcore_starter_toolkit import Runtime
 from boto3.session import Session
+from botocore.exceptions import ClientError
+
+# Status polling: start at $AGENTCORE_POLL_SECONDS (default 2s) and back off
+# by 1.5x with jitter, capped at STATUS_POLL_MAX_DELAY.
+STATUS_POLL_MAX_DELAY = 20.0
+STATUS_POLL_BACKOFF = 1.5
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException"}
 
 
 def main() -> int:
@@ -49,7 +58,10 @@ def main() -> int:
     parser.add_argument(
         "--wait",
         action="store_true",
-        help="Wait for runtime to reach READY and print status transitions",
+        help=(
+            "Wait for runtime to reach READY and print status transitions. "
+            "Polling starts every $AGENTCORE_POLL_SECONDS (default 2) and backs off to 20s."
+        ),
     )
     parser.add_argument(
         "--auto-update-on-conflict",
@@ -100,13 +112,22 @@ def main() -> int:
         return 0
 
     end_status = {"READY", "CREATE_FAILED", "DELETE_FAILED", "UPDATE_FAILED"}
+    delay = float(os.getenv("AGENTCORE_POLL_SECONDS", "2"))
     while True:
-        status_response = agentcore_runtime.status()
+        try:
+            status_response = agentcore_runtime.status()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in THROTTLING_ERROR_CODES:
+                raise
+            delay = min(delay * 2, STATUS_POLL_MAX_DELAY)
+            time.sleep(delay)
+            continue
         status = status_response.endpoint.get("status")
         print("Status:", status)
         if status in end_status:
             break
-        time.sleep(10)
+        time.sleep(delay * random.uniform(0.9, 1.1))
+        delay = min(delay * STATUS_POLL_BACKOFF, STATUS_POLL_MAX_DELAY)
 
     return 0
 
@@ -5,14 +5,30 @@ A simple agent that uses a worker-evaluator pattern to answer math questions.
 
 import json
 import os
+import re
+import sys
 from typing import Any, Annotated, Iterator, Literal, TypedDict
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, SystemMessage, BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import tool
 from langchain_aws import ChatBedrock
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import ToolNode
 from operator import add
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 
 # ===== MATH TOOLS =====
 
@@ -88,41 +104,127 @@ class WorkerEvaluatorState(TypedDict):
 
 # ===== CONFIGURATION =====
 
-# Initialize Bedrock Claude Sonnet 4.5 (v2)
+# Identical (prompt, model config) calls are answered from a cache instead of
+# another Bedrock round trip: Redis (shared across processes) when REDIS_URL is
+# set and the agent_core package is importable, otherwise in-process memory.
 _bedrock_region = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-west-2"
+try:
+    from agent_core.bedrock_client import bedrock_runtime_client
+    from agent_core.redis_llm_cache import configure_llm_cache
+except ImportError:
+    set_llm_cache(InMemoryCache(maxsize=1024))
+    _model_kwargs = {}
+else:
+    configure_llm_cache(region_name=_bedrock_region)
+    # Share the process-wide pooled bedrock-runtime client.
+    _model_kwargs = {"client": bedrock_runtime_client(_bedrock_region)}
+
+# Initialize Bedrock Claude Sonnet 4.5 (v2)
 model = ChatBedrock(
     model_id="anthropic.claude-3-5-sonnet-20241022-v2:0",
     region_name=_bedrock_region,
+    **_model_kwargs,
 )
 
 # Create tool list and bind to model
 tools = [add_numbers, subtract_numbers, multiply_numbers, divide_numbers]
 model_with_tools = model.bind_tools(tools)
 
-# Create tool node for executing tools
-tool_node = ToolNode(tools)
+# Plain functions behind the tools, for executing and recomputing tool calls
+_TOOL_FNS = {t.name: t.func for t in tools}
+
+
+def _run_tool_call(tool_call: dict) -> ToolMessage:
+    """Execute one math tool call directly, skipping StructuredTool validation."""
+    try:
+        # Every math tool takes float arguments; coerce as the tool schema would.
+        args = {name: float(value) for name, value in tool_call["args"].items()}
+        content, status = str(_TOOL_FNS[tool_call["name"]](**args)), "success"
+    except Exception as e:
+        # Report the failure back to the model, like ToolNode's default handler.
+        content, status = f"Error: {e!r}\n Please fix your mistakes.", "error"
+    return ToolMessage(
+        content=content,
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        status=status,
+    )
+
+
+def fast_tool_node(state: WorkerEvaluatorState) -> dict:
+    """Execute the worker's pending tool calls.
+
+    The math tools are pure and take microseconds, so they are called inline
+    through `_TOOL_FNS` rather than via ToolNode's per-call tool invocation,
+    argument validation and thread-pool dispatch.
+    """
+    tool_calls = state["messages"][-1].tool_calls
+    return {"messages": [_run_tool_call(tool_call) for tool_call in tool_calls]}
 
 
 # ===== AGENT NODES =====
 
-def worker(state: WorkerEvaluatorState) -> dict:
-    """
-    Worker node that processes the user's question and uses math tools.
-    The worker attempts to solve the math problem using available tools.
-    """
-    messages = state["messages"]
-    
-    # Add system message for the worker
-    system_prompt = SystemMessage(content="""You are a mathematical worker agent. 
+SYSTEM_PROMPT = """You are a mathematical worker agent. 
 Your job is to solve math problems using the available tools: add_numbers, subtract_numbers, 
 multiply_numbers, and divide_numbers. Break down complex problems step by step.
-Use tools to perform calculations and show your work.""")
-    
-    worker_messages = [system_prompt] + messages
-    
-    # Invoke the model with tools
-    response = model_with_tools.invoke(worker_messages)
+Use tools to perform calculations and show your work."""
+
+EVAL_SYSTEM_PROMPT = """You are an evaluation agent that checks mathematical work.
+Review the worker's calculations and verify they are correct. 
+The question and the worker's output are given in the user message.
+
+Check:
+1. Are the calculation steps logical?
+2. Are the tool calls appropriate?
+3. Is the final answer correct?
+
+If everything is correct, approve it. If there are errors, point them out."""
+
+
+def _cached_system_message(text: str) -> SystemMessage:
+    # Cache checkpoint for Anthropic prompt caching (5-minute TTL). It only takes
+    # effect once the prefix up to it (tool definitions + system prompt) reaches
+    # the model's minimum cacheable length, 1,024 tokens for Claude 3.5 Sonnet.
+    # Today's prompts are well below that, so Bedrock ignores the marker and
+    # bills them normally; it starts paying off if the prompts grow.
+    return SystemMessage(
+        content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+    )
+
+
+# Built once: the system prompts are static, so the request prefix is identical
+# across calls.
+WORKER_SYSTEM_MESSAGE = _cached_system_message(SYSTEM_PROMPT)
+EVAL_SYSTEM_MESSAGE = _cached_system_message(EVAL_SYSTEM_PROMPT)
+
+
+# Most recent messages sent to the worker in addition to the question
+HISTORY_TAIL = 6
 
+
+def _compact_history(messages: list[BaseMessage], keep_tail: int = HISTORY_TAIL) -> list[BaseMessage]:
+    """Keep the original question and the last `keep_tail` messages.
+
+    Earlier tool-call turns are dropped so the worker prompt stays bounded as
+    tool round trips accumulate. The tail always starts on an AI turn, so a
+    tool result is never sent without the tool call that produced it.
+    """
+    if len(messages) <= keep_tail + 1:
+        return messages
+    start = len(messages) - keep_tail
+    while start > 1 and not isinstance(messages[start], AIMessage):
+        start -= 1
+    head = [m for m in messages[:1] if isinstance(m, HumanMessage)]
+    return head + messages[start:]
+
+
+def _worker_messages(state: WorkerEvaluatorState) -> list[BaseMessage]:
+    """Build the worker prompt: system instructions followed by the recent conversation."""
+    return [WORKER_SYSTEM_MESSAGE] + _compact_history(state["messages"])
+
+
+def _worker_update(response: AIMessage) -> dict:
+    """Turn the worker model response into a state update."""
     # Only persist `worker_output` when the worker has produced a final response
     # (i.e., no tool calls are pending). This prevents routing to the evaluator
     # prematurely right after the first tool-use turn.
@@ -136,33 +238,33 @@ Use tools to perform calculations and show your work.""")
     }
 
 
-def evaluator(state: WorkerEvaluatorState) -> dict:
+def worker(state: WorkerEvaluatorState) -> dict:
     """
-    Evaluator node that checks the worker's output for correctness.
-    The evaluator reviews the calculation steps and validates the answer.
+    Worker node that processes the user's question and uses math tools.
+    The worker attempts to solve the math problem using available tools.
     """
+    # Invoke the model with tools
+    response = model_with_tools.invoke(_worker_messages(state))
+    return _worker_update(response)
+
+
+async def aworker(state: WorkerEvaluatorState) -> dict:
+    """Async variant of `worker`, used by `graph.ainvoke`/`graph.astream`."""
+    response = await model_with_tools.ainvoke(_worker_messages(state))
+    return _worker_update(response)
+
+
+def _evaluation_messages(state: WorkerEvaluatorState) -> list[BaseMessage]:
+    """Build the evaluator prompt from the question and the worker's final answer."""
     messages = state["messages"]
     worker_output = state.get("worker_output", "")
     question = ""
     if messages and isinstance(messages[0], HumanMessage):
         question = messages[0].content
     
-    # Add system message for the evaluator
-    system_prompt = SystemMessage(content=f"""You are an evaluation agent that checks mathematical work.
-Review the worker's calculations and verify they are correct. 
-
-Worker's output: {worker_output}
-
-Check:
-1. Are the calculation steps logical?
-2. Are the tool calls appropriate?
-3. Is the final answer correct?
-
-If everything is correct, approve it. If there are errors, point them out.""")
-    
     # Keep evaluation context tight so the evaluator evaluates instead of continuing to solve.
-    evaluation_messages = [
-        system_prompt,
+    return [
+        EVAL_SYSTEM_MESSAGE,
         HumanMessage(
             content=(
                 f"Question: {question}\n\n"
@@ -170,9 +272,15 @@ If everything is correct, approve it. If there are errors, point them out.""")
             )
         ),
     ]
-    
+
+
+def evaluator(state: WorkerEvaluatorState) -> dict:
+    """Evaluator node that checks the worker's output for correctness.
+
+    The evaluator reviews the calculation steps and validates the answer.
+    """
     # Invoke the model for evaluation
-    response = model.invoke(evaluation_messages)
+    response = model.invoke(_evaluation_messages(state))
     
     return {
         "messages": [response],
@@ -180,14 +288,57 @@ If everything is correct, approve it. If there are errors, point them out.""")
     }
 
 
+async def aevaluator(state: WorkerEvaluatorState) -> dict:
+    """Async variant of `evaluator`, used by `graph.ainvoke`/`graph.astream`."""
+    response = await model.ainvoke(_evaluation_messages(state))
+    return {
+        "messages": [response],
+        "evaluation_result": str(response.content)
+    }
+
+
 # ===== ROUTING LOGIC =====
 
+_NUMBER_RE = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
+
+def _answer_matches_tool_results(messages: list[BaseMessage], worker_output: str) -> bool:
+    """Check the worker's answer against its tool calls without an LLM.
+
+    Every recorded math tool call is recomputed locally (the tools are pure
+    functions of a and b) and must match its ToolMessage; the last number in
+    the worker's answer must equal the final tool result. Anything else,
+    including answers without tool calls, still goes to the evaluator.
+    """
+    results = {m.tool_call_id: m.content for m in messages if isinstance(m, ToolMessage)}
+    final_result = None
+    for message in messages:
+        for call in getattr(message, "tool_calls", None) or ():
+            fn = _TOOL_FNS.get(call["name"])
+            if fn is None or call["id"] not in results:
+                return False
+            try:
+                value = fn(**call["args"])
+                recorded = float(results[call["id"]])
+            except (TypeError, ValueError, ZeroDivisionError):
+                return False
+            if value != recorded:
+                return False
+            final_result = value
+    if final_result is None:
+        return False
+
+    numbers = _NUMBER_RE.findall(worker_output)
+    return bool(numbers) and float(numbers[-1].replace(",", "")) == final_result
+
+
 def should_continue(state: WorkerEvaluatorState) -> Literal["tools", "evaluator"] | str:
     """
     Determine the next step based on the current state.
     
     - If the last message has tool calls, route to tools
-    - If we have worker output but no evaluation, route to evaluator
+    - If we have worker output but no evaluation, route to evaluator, unless
+      the answer is confirmed by recomputing the tool calls
     - Otherwise, end the conversation
     """
     messages = state["messages"]
@@ -199,6 +350,9 @@ def should_continue(state: WorkerEvaluatorState) -> Literal["tools", "evaluator"
     
     # If we have worker output but haven't evaluated yet
     if state.get("worker_output") and not state.get("evaluation_result"):
+        # Skip the evaluator LLM call when the answer is verifiably tool-derived
+        if _answer_matches_tool_results(messages, state["worker_output"]):
+            return END
         return "evaluator"
     
     # Otherwise, we're done
@@ -223,9 +377,11 @@ def route_after_tools(state: WorkerEvaluatorState) -> Literal["worker", "evaluat
 builder = StateGraph(WorkerEvaluatorState)
 
 # Add nodes
-builder.add_node("worker", worker)
-builder.add_node("tools", tool_node)
-builder.add_node("evaluator", evaluator)
+# Model nodes carry sync and async implementations, so the same graph serves
+# `invoke`/`stream` and non-blocking `ainvoke`/`astream`.
+builder.add_node("worker", RunnableLambda(worker, afunc=aworker))
+builder.add_node("tools", fast_tool_node)
+builder.add_node("evaluator", RunnableLambda(evaluator, afunc=aevaluator))
 
 # Add edges
 builder.add_edge(START, "worker")
@@ -239,6 +395,22 @@ graph = builder.compile()
 
 # ===== ENTRY POINT =====
 
+def _final_result(question: str, result: dict) -> dict:
+    """Shape the final graph state into the public answer dict."""
+    worker_output = result.get("worker_output", "")
+    # The graph ends after the evaluator node, so the last message is typically the evaluator.
+    # For a user-facing final answer, prefer the worker's final output.
+    final_answer = worker_output or (result["messages"][-1].content if result["messages"] else "")
+
+    return {
+        "question": question,
+        "messages": result["messages"],
+        "worker_output": worker_output,
+        "evaluation_result": result.get("evaluation_result", ""),
+        "final_answer": final_answer,
+    }
+
+
 def answer_math_question(question: str) -> dict:
     """
     Answer a math question using the worker-evaluator agent.
@@ -254,33 +426,69 @@ def answer_math_question(question: str) -> dict:
         "worker_output": "",
         "evaluation_result": ""
     })
-    
-    worker_output = result.get("worker_output", "")
-    # The graph ends after the evaluator node, so the last message is typically the evaluator.
-    # For a user-facing final answer, prefer the worker's final output.
-    final_answer = worker_output or (result["messages"][-1].content if result["messages"] else "")
+    return _final_result(question, result)
 
-    return {
-        "question": question,
-        "messages": result["messages"],
-        "worker_output": worker_output,
-        "evaluation_result": result.get("evaluation_result", ""),
-        "final_answer": final_answer,
-    }
+
+async def answer_math_question_async(question: str) -> dict:
+    """Async variant of `answer_math_question`.
+
+    Model calls go through `ChatBedrock.ainvoke`, so one event loop can keep many
+    questions in flight at once.
+    """
+    result = await graph.ainvoke({
+        "messages": [HumanMessage(content=question)],
+        "worker_output": "",
+        "evaluation_result": ""
+    })
+    return _final_result(question, result)
+
+
+_JSON_PRIMITIVES = (str, int, float, bool, type(None))
+# Optional message fields included in streamed events when set
+_MESSAGE_FIELDS = ("name", "tool_call_id", "tool_calls")
+
+
+def _serialize_message(msg: Any) -> dict[str, Any]:
+    data: dict[str, Any] = {"type": type(msg).__name__}
+    content = getattr(msg, "content", None)
+    if content is not None:
+        data["content"] = content
+    for field in _MESSAGE_FIELDS:
+        value = getattr(msg, field, None)
+        if value:
+            data[field] = value
+    return data
+
+
+def _json_safe(value: Any) -> Any:
+    """Best-effort conversion to JSON-serializable data."""
+    if isinstance(value, _JSON_PRIMITIVES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    # LangChain messages
+    if isinstance(value, BaseMessage) or hasattr(value, "content"):
+        return _serialize_message(value)
+    # Anything else is opaque to JSON
+    return str(value)
 
 
 def answer_math_question_streaming(
     question: str,
     *,
-    stream_mode: Literal["updates", "values"] = "updates",
+    stream_mode: Literal["updates", "values", "messages"] = "updates",
 ) -> Iterator[dict[str, Any]]:
     """Stream each graph step back to the caller.
 
-    Yields one event per node execution.
+    Yields one event per node execution, or one per model token in
+    "messages" mode.
 
     Event shape:
       {"node": <node_name>, "update": <partial_state_update>}   (stream_mode="updates")
       {"node": "__values__", "values": <full_state>}           (stream_mode="values")
+      {"node": <node_name>, "token": <text>}                   (stream_mode="messages")
     """
 
     initial_state: WorkerEvaluatorState = {
@@ -289,39 +497,6 @@ def answer_math_question_streaming(
         "evaluation_result": "",
     }
 
-    def _serialize_message(msg: Any) -> dict[str, Any]:
-        data: dict[str, Any] = {
-            "type": msg.__class__.__name__,
-        }
-        if hasattr(msg, "content"):
-            data["content"] = msg.content
-        if hasattr(msg, "name") and getattr(msg, "name"):
-            data["name"] = msg.name
-        if hasattr(msg, "tool_call_id") and getattr(msg, "tool_call_id"):
-            data["tool_call_id"] = msg.tool_call_id
-        if hasattr(msg, "tool_calls") and getattr(msg, "tool_calls"):
-            data["tool_calls"] = msg.tool_calls
-        return data
-
-    def _json_safe(value: Any) -> Any:
-        """Best-effort conversion to JSON-serializable data."""
-        if isinstance(value, (str, int, float, bool)) or value is None:
-            return value
-        if isinstance(value, list):
-            return [_json_safe(v) for v in value]
-        if isinstance(value, dict):
-            return {str(k): _json_safe(v) for k, v in value.items()}
-        # LangChain messages
-        if isinstance(value, BaseMessage) or hasattr(value, "content"):
-            return _serialize_message(value)
-
-        # Fallback: try native JSON; otherwise string-repr
-        try:
-            json.dumps(value)
-            return value
-        except TypeError:
-            return str(value)
-
     if stream_mode == "updates":
         for event in graph.stream(initial_state, stream_mode="updates"):
             # `event` is a dict keyed by node name -> partial update
@@ -337,6 +512,22 @@ def answer_math_question_streaming(
                 yield payload
         return
 
+    if stream_mode == "messages":
+        # Chat models stream through LangGraph's callback handler in this mode,
+        # so text arrives as Bedrock produces it rather than per finished node.
+        for chunk, metadata in graph.stream(initial_state, stream_mode="messages"):
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            content = chunk.content
+            if not isinstance(content, str):
+                # Structured content blocks: keep the text deltas only.
+                content = "".join(
+                    block.get("text", "") for block in content if isinstance(block, dict)
+                )
+            if content:
+                yield {"node": metadata.get("langgraph_node"), "token": content}
+        return
+
     # stream_mode == "values"
     for values in graph.stream(initial_state, stream_mode="values"):
         yield {"node": "__values__", "values": _json_safe(values)}
@@ -346,4 +537,4 @@ if __name__ == "__main__":
     # Minimal streaming demo (no question-loop prints).
     question = "What is (10 + 5) * 3?"
     for step in answer_math_question_streaming(question, stream_mode="values"):
-        print(json.dumps(step, ensure_ascii=False))
+        sys.stdout.buffer.write(_dumps(step) + b"\n")
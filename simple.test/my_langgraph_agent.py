@@ -2,14 +2,21 @@ from bedrock_agentcore import BedrockAgentCoreApp
 from langgraph.graph import StateGraph, START, END, MessagesState
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_aws import ChatBedrock
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
 
 app = BedrockAgentCoreApp()
 
+# Answer repeated identical prompts from memory instead of calling Bedrock again
+set_llm_cache(InMemoryCache(maxsize=1024))
+
+# Built once so every request reuses the same boto3 client and its connection pool
+llm = ChatBedrock(model_id="anthropic.claude-3-5-sonnet-20241022-v2:0")
+
 # Create a simple LangGraph agent
-def chatbot(state: MessagesState):
+async def chatbot(state: MessagesState):
     """Simple chatbot node that responds to messages."""
-    llm = ChatBedrock(model_id="anthropic.claude-3-5-sonnet-20241022-v2:0")
-    response = llm.invoke(state["messages"])
+    response = await llm.ainvoke(state["messages"])
     return {"messages": [response]}
 
 # Build the graph
@@ -21,11 +28,12 @@ graph = builder.compile()
 
 
 @app.entrypoint
-def invoke(payload):
+async def invoke(payload):
     """Your AI agent function"""
     user_message = payload.get("prompt", "Hello! How can I help you today?")
     
-    response = graph.invoke(
+    # Async so concurrent requests share the server's event loop
+    response = await graph.ainvoke(
         {"messages": [HumanMessage(content=user_message)]}
     )
     
@@ -0,0 +1,40 @@
+"""Shared boto3 session and bedrock-runtime client.
+
+Pass `bedrock_runtime_client(region)` to `ChatBedrock(client=...)` so every
+model in the process reuses one credential chain and one pooled set of TLS
+connections instead of building a client per model (or per call).
+"""
+
+from functools import cache
+from typing import Any, Optional
+
+import boto3
+from botocore.config import Config
+
+DEFAULT_REGION = "us-west-2"
+
+# One session per process so the credential provider chain is resolved once.
+BOTO_SESSION = boto3.Session()
+
+_BEDROCK_RUNTIME_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+
+@cache
+def bedrock_runtime_client(region_name: Optional[str] = None) -> Any:
+    """Return the process-wide bedrock-runtime client for `region_name`.
+
+    Args:
+        region_name: AWS region; defaults to the session region, then us-west-2
+
+    Returns:
+        A botocore `BedrockRuntime` client
+    """
+    return BOTO_SESSION.client(
+        "bedrock-runtime",
+        region_name=region_name or BOTO_SESSION.region_name or DEFAULT_REGION,
+        config=_BEDROCK_RUNTIME_CONFIG,
+    )
@@ -0,0 +1,240 @@
+"""Redis-backed LLM response cache shared across processes.
+
+Exact hits are keyed by a SHA256 of (llm_string, prompt). When an embeddings
+model is supplied, misses fall back to a semantic lookup over a RediSearch
+vector index, so paraphrased prompts for the same model reuse a response.
+The semantic layer is opt-in per caller and never applies to tool-calling
+prompts: the cached "prompt" is the whole conversation, so prompts that differ
+only in a number or a tool result look near-identical to an embedding model.
+
+Redis errors are logged and treated as cache misses, so an outage slows model
+calls down instead of failing them.
+
+`configure_llm_cache()` uses Redis when REDIS_URL is set (requires the `redis`
+package) and an in-process InMemoryCache otherwise.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache, InMemoryCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.globals import set_llm_cache
+from langchain_core.load import dumps, loads
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # redis is optional; only RedisLLMCache needs it
+    class RedisError(Exception):
+        """Placeholder so the handlers below resolve without redis installed."""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# Cosine distance below which a cached prompt counts as the same question
+# (i.e. cosine similarity >= 0.9).
+DEFAULT_DISTANCE_THRESHOLD = 0.1
+# Embeddings computed on a semantic miss, kept until the matching update
+_MISS_VECTORS_SIZE = 256
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _uses_tools(prompt: str, llm_string: str) -> bool:
+    # Tools bound to the model show up in the llm string (as a repr'd or JSON
+    # key); tool results in the serialized conversation. Either way a cached
+    # response may carry tool calls or depend on exact tool output, so only
+    # exact hits are safe.
+    return "'tools'" in llm_string or '"tools"' in llm_string or "ToolMessage" in prompt
+
+
+class RedisLLMCache(BaseCache):
+    """LLM cache storing serialized generations in Redis with a TTL."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        prefix: str = "llmcache:",
+        embeddings: Optional[Embeddings] = None,
+        distance_threshold: float = DEFAULT_DISTANCE_THRESHOLD,
+        index_name: str = "llmcache_idx",
+    ):
+        """Initialize the cache.
+
+        Args:
+            client: A `redis.Redis` client
+            ttl: Seconds each entry is kept
+            prefix: Key prefix for cache entries
+            embeddings: Optional embeddings model enabling semantic lookups
+            distance_threshold: Maximum cosine distance for a semantic hit
+            index_name: RediSearch index used for semantic lookups
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.embeddings = embeddings
+        self.distance_threshold = distance_threshold
+        self.index_name = index_name
+        self._index_ready = False
+        self._miss_vectors: OrderedDict[str, bytes] = OrderedDict()
+        self._miss_lock = threading.Lock()
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return f"{self.prefix}{_sha256(llm_string + chr(0) + prompt)}"
+
+    def _get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        raw = self.client.get(key)
+        if raw is None:
+            return None
+        return [loads(gen) for gen in json.loads(raw)]
+
+    def _semantic(self, prompt: str, llm_string: str) -> bool:
+        return self.embeddings is not None and not _uses_tools(prompt, llm_string)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up an exact match first, then a semantically similar prompt."""
+        key = self._key(prompt, llm_string)
+        try:
+            hit = self._get(key)
+            if hit is not None or not self._semantic(prompt, llm_string):
+                return hit
+            vector = self._vector(prompt)
+            # Keep the embedding for the update that follows this miss
+            with self._miss_lock:
+                self._miss_vectors[key] = vector
+                if len(self._miss_vectors) > _MISS_VECTORS_SIZE:
+                    self._miss_vectors.popitem(last=False)
+            similar_key = self._semantic_lookup(vector, llm_string)
+            return self._get(similar_key) if similar_key else None
+        except RedisError as e:
+            logger.warning("LLM cache lookup failed, treating as a miss: %s", e)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations for the prompt and, if enabled, its embedding."""
+        key = self._key(prompt, llm_string)
+        with self._miss_lock:
+            vector = self._miss_vectors.pop(key, None)
+        try:
+            self.client.setex(key, self.ttl, json.dumps([dumps(gen) for gen in return_val]))
+            if self._semantic(prompt, llm_string):
+                self._index_prompt(vector or self._vector(prompt), llm_string, key)
+        except RedisError as e:
+            logger.warning("LLM cache update failed, skipping: %s", e)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete every entry under this cache's prefix."""
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    # ----- semantic layer -----
+
+    def _vector(self, prompt: str) -> bytes:
+        return array("f", self.embeddings.embed_query(prompt)).tobytes()
+
+    def _ensure_index(self, dim: int) -> None:
+        if self._index_ready:
+            return
+        from redis.commands.search.field import TagField, TextField, VectorField
+        from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+        from redis.exceptions import ResponseError
+
+        try:
+            self.client.ft(self.index_name).create_index(
+                [
+                    TagField("llm"),
+                    TextField("key"),
+                    VectorField(
+                        "embedding",
+                        "HNSW",
+                        {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": "COSINE"},
+                    ),
+                ],
+                definition=IndexDefinition(prefix=[f"{self.prefix}vec:"], index_type=IndexType.HASH),
+            )
+        except ResponseError as e:
+            if "already exists" not in str(e).lower():
+                raise
+        self._index_ready = True
+
+    def _index_prompt(self, vector: bytes, llm_string: str, key: str) -> None:
+        self._ensure_index(len(vector) // 4)
+        vec_key = f"{self.prefix}vec:{key[len(self.prefix):]}"
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(vec_key, mapping={"llm": _sha256(llm_string), "key": key, "embedding": vector})
+        pipe.expire(vec_key, self.ttl)
+        pipe.execute()
+
+    def _semantic_lookup(self, vector: bytes, llm_string: str) -> Optional[str]:
+        from redis.commands.search.query import Query
+        from redis.exceptions import ResponseError
+
+        query = (
+            Query(f"(@llm:{{{_sha256(llm_string)}}})=>[KNN 1 @embedding $vec AS score]")
+            .sort_by("score")
+            .return_fields("key", "score")
+            .dialect(2)
+        )
+        try:
+            docs = self.client.ft(self.index_name).search(
+                query, query_params={"vec": vector}
+            ).docs
+        except ResponseError:
+            # Index not created yet (nothing cached) or RediSearch unavailable.
+            return None
+        if not docs or float(docs[0].score) > self.distance_threshold:
+            return None
+        key = docs[0].key
+        return key.decode() if isinstance(key, bytes) else key
+
+
+def configure_llm_cache(
+    redis_url: Optional[str] = None,
+    *,
+    semantic: bool = False,
+    embedding_model_id: str = "amazon.titan-embed-text-v2:0",
+    region_name: Optional[str] = None,
+    maxsize: int = 1024,
+) -> BaseCache:
+    """Register the process-wide LLM cache and return it.
+
+    Args:
+        redis_url: Redis URL; defaults to $REDIS_URL. Without one, an
+            in-process InMemoryCache is used.
+        semantic: Enable the embedding layer. Only for callers whose prompts
+            are standalone questions; never on by default.
+        embedding_model_id: Bedrock embedding model for semantic lookups
+        region_name: Bedrock region for the embedding model
+        maxsize: Size of the in-memory fallback cache
+
+    Returns:
+        The cache instance passed to `set_llm_cache`
+    """
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if not redis_url:
+        cache: BaseCache = InMemoryCache(maxsize=maxsize)
+        set_llm_cache(cache)
+        return cache
+
+    import redis
+
+    embeddings = None
+    if semantic:
+        from langchain_aws import BedrockEmbeddings
+
+        embeddings = BedrockEmbeddings(model_id=embedding_model_id, region_name=region_name)
+
+    cache = RedisLLMCache(redis.from_url(redis_url), embeddings=embeddings)
+    set_llm_cache(cache)
+    return cache
@@ -1,4 +1,5 @@
 from pathlib import Path
+import asyncio
 import sys
 import boto3
 from langchain_core.messages import HumanMessage
@@ -6,53 +7,139 @@ from bedrock_agentcore import BedrockAgentCoreApp
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph_checkpoint_aws import AgentCoreMemorySaver
 
+import json
 import os
+import time
 import dotenv
 
 
+SSM_PREFIX = "/deep_research_scoping_agent"
+ENV_KEYS = ["ANTHROPIC_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT",
+            "LANGSMITH_TRACING", "OPENAI_API_KEY", "TAVILY_API_KEY"]
+# Opt-in: set SSM_CACHE_TTL (seconds) to cache the decrypted parameters on
+# local disk so repeated cold starts in the same container skip SSM. Off by
+# default because the file holds API keys in plaintext and rotated keys stay
+# stale until the TTL expires.
+SSM_CACHE_FILE = Path(os.getenv("SSM_CACHE_FILE", Path.home() / ".cache" / "deep_research_ssm.json"))
+SSM_CACHE_TTL = float(os.getenv("SSM_CACHE_TTL", 0))
+
+
+def _read_ssm_cache():
+    if SSM_CACHE_TTL <= 0:
+        return None
+    try:
+        entry = json.loads(SSM_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("fetched_at", 0) > SSM_CACHE_TTL:
+        return None
+    values = entry.get("values") or {}
+    return values if all(key in values for key in ENV_KEYS) else None
+
+
+def _write_ssm_cache(values):
+    if SSM_CACHE_TTL <= 0:
+        return
+    try:
+        SSM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = SSM_CACHE_FILE.with_suffix(".tmp")
+        # The values are secrets: keep the file readable by the owner only.
+        # O_EXCL after unlinking, so a pre-existing file's mode is never reused.
+        tmp_file.unlink(missing_ok=True)
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fetched_at": time.time(), "values": values}, f)
+        os.replace(tmp_file, SSM_CACHE_FILE)
+    except OSError as e:
+        print(f"Could not write SSM cache {SSM_CACHE_FILE}: {e}")
+
+
 def load_env():
     env_path = Path(__file__).parents[1] / '.env'
 
     if False and env_path.exists():
         print(f"Loading environment from .env file: {env_path}")
         dotenv.load_dotenv(env_path)
+        return
+
+    values = _read_ssm_cache()
+    if values is not None:
+        print(f"Environment loaded from SSM cache: {SSM_CACHE_FILE}")
     else:
         print(f".env file not found, loading from AWS SSM Parameter Store")
-        keys = ["ANTHROPIC_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT",
-                "LANGSMITH_TRACING", "OPENAI_API_KEY", "TAVILY_API_KEY"]
-        
         client = boto3.client('ssm', region_name='us-west-2')
-        
-        for key in keys:
-            key_path = f'/deep_research_scoping_agent/{key}'
-            response = client.get_parameter(Name=key_path, WithDecryption=True)
-            os.environ[key] = response['Parameter']['Value']
-            print(f"{key} loaded from SSM")
 
-load_env()
+        # One batched call instead of a round trip per key (limit is 10 names)
+        response = client.get_parameters(
+            Names=[f'{SSM_PREFIX}/{key}' for key in ENV_KEYS], WithDecryption=True
+        )
+        if response['InvalidParameters']:
+            raise KeyError(f"Missing SSM parameters: {response['InvalidParameters']}")
+        values = {p['Name'].rsplit('/', 1)[-1]: p['Value'] for p in response['Parameters']}
+        _write_ssm_cache(values)
+
+    for key in ENV_KEYS:
+        os.environ[key] = values[key]
+        print(f"{key} loaded from SSM")
 
 sys.path.append(str(Path(__file__).parents[1]))
-from deep_research.research_agent_scope import deep_researcher_builder
+from agent_core.redis_llm_cache import configure_llm_cache
 
 app = BedrockAgentCoreApp()
+# Identical model calls are served from Redis when REDIS_URL is set (shared by
+# all server processes), otherwise from an in-process cache
+configure_llm_cache(region_name="us-west-2")
 #checkpointer = InMemorySaver()
 
+# CHECKPOINT_DB points at a local SQLite file for runs outside AgentCore (thread
+# state survives restarts without a memory resource); otherwise threads are
+# kept in AgentCore Memory.
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB")
+
 agent = None
-try :
+_agent_lock = asyncio.Lock()
+
+
+async def _make_checkpointer():
+    if CHECKPOINT_DB:
+        # AsyncSqliteSaver binds to the running event loop, so it can only be
+        # created inside the server's loop.
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        print(f"Initializing AsyncSqliteSaver at {CHECKPOINT_DB}...")
+        return AsyncSqliteSaver(await aiosqlite.connect(CHECKPOINT_DB))
     print("Initializing AgentCoreMemorySaver...")
     #checkpointer = InMemorySaver()
-    checkpointer = AgentCoreMemorySaver("DeepResearchAgent-7gZmvrCKCl", region_name="us-west-2")
-    agent = deep_researcher_builder.compile(checkpointer=checkpointer)
-except Exception as e:
-    print("Error initializing AgentCoreMemorySaver:", e)
+    return AgentCoreMemorySaver("DeepResearchAgent-7gZmvrCKCl", region_name="us-west-2")
+
+
+async def _get_agent():
+    """Return the compiled agent, building it on the first request.
+
+    Loading secrets, importing the research graph (its models need the API
+    keys) and compiling it are deferred, so importing this module or serving
+    /ping makes no SSM calls and does not pay the compile cost.
+    """
+    global agent
+    if agent is None:
+        async with _agent_lock:
+            if agent is None:
+                await asyncio.to_thread(load_env)
+                from deep_research.research_agent_scope import deep_researcher_builder
+
+                agent = deep_researcher_builder.compile(checkpointer=await _make_checkpointer())
+    return agent
+
 
 @app.entrypoint
-def langgraph_bedrock(payload):
+async def langgraph_bedrock(payload):
     user_input = payload.get("prompt")
     thread_id = payload.get("thread_id", "default")
     actor_id = payload.get("actor_id", "default_actor")
     
-    response = agent.invoke(
+    # Async graph execution lets one server process overlap concurrent requests' model calls
+    response = await (await _get_agent()).ainvoke(
         {"messages": [HumanMessage(content=user_input)]},
         config={"configurable": {"thread_id": thread_id, "actor_id": actor_id}}
     )
@@ -68,6 +155,10 @@ To run the app as a server, use the command:
     cd src/agent_core
     python scoping_agent_core.py
 
+    To keep thread state in a local SQLite file instead of AgentCore Memory
+    (requires langgraph-checkpoint-sqlite):
+    CHECKPOINT_DB=checkpoints.db python scoping_agent_core.py
+
 To test: 
     curl -X POST http://localhost:8080/invocations   -H "Content-Type: application/json"   -d '{"prompt": "I want to research the best coffee shops in San Francisco.", "thread_id": "test-thread-2"}'   
     curl -X POST http://localhost:8080/invocations   -H "Content-Type: application/json"   -d '{"prompt": "Let's focus on coffe quality.", "thread_id": "test-thread-2"}'   
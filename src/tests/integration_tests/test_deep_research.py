@@ -1,4 +1,5 @@
 from pathlib import Path
+import asyncio
 import sys
 import dotenv
 
@@ -49,12 +50,16 @@ def test_agent_core_entrypoint():
         "thread_id": "test-thread-1"
     }
     
-    result = langgraph_bedrock(payload)
-    assert 'best' in result['messages'][-1].content
-
-    result = langgraph_bedrock({
-        "prompt": "Let's focus on coffee bean grading and sourcing quality",
-        "thread_id": "test-thread-1"  # Same thread
-    })
+    # Both turns run on one event loop: the agent's async model clients and
+    # checkpointer are bound to the loop they were first used on
+    async def run_both_turns():
+        first = await langgraph_bedrock(payload)
+        followup = await langgraph_bedrock({
+            "prompt": "Let's focus on coffee bean grading and sourcing quality",
+            "thread_id": "test-thread-1"  # Same thread
+        })
+        return first, followup
 
-    assert len(result['research_brief']) > 10
+    result, followup = asyncio.run(run_both_turns())
+    assert 'best' in result['messages'][-1].content
+    assert len(followup['research_brief']) > 10
\ No newline at end of file